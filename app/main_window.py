@@ -4,11 +4,16 @@ Main application window and controller
 
 import customtkinter as ctk
 import tkinter as tk
-from tkinter import messagebox, filedialog
+from tkinter import messagebox
+import hashlib
 import json
+import mmap
 import os
+import queue
+import re
 import threading
 import time
+import traceback
 
 from ui.toolbar import Toolbar
 from ui.component_palette import ComponentPalette
@@ -16,9 +21,24 @@ from ui.properties_panel import PropertiesPanel
 from canvas.design_canvas import DesignCanvas
 from canvas.canvas_manager import CanvasManager
 from utils.file_manager import FileManager
-from utils.export_manager import ExportManager
+from utils import json_io, compression
 from config.settings import AppSettings
-from config.themes import AppThemes
+
+# Auto-save payloads start with their metadata object
+_METADATA_PREFIX = re.compile(rb'\s*\{\s*"metadata"\s*:')
+
+# Payloads at least this large bypass the page cache where O_DIRECT exists
+_DIRECT_WRITE_THRESHOLD = 8 * 1024 * 1024
+_DIRECT_WRITE_ALIGN = 4096
+
+_BASE_TITLE = "Mini Figma - UI Wireframe Designer"
+
+# Fixed part of the auto-save metadata, shared by every cycle
+_AUTOSAVE_META_TEMPLATE = {
+    "version": "1.0",
+    "auto_save": True,
+    "app_name": _BASE_TITLE
+}
 
 class MainWindow:
     """Main application window class"""
@@ -30,19 +50,22 @@ class MainWindow:
         ctk.set_default_color_theme("blue")
         
         self.root = ctk.CTk()
-        self.root.title("Mini Figma - UI Wireframe Designer")
+        self.root.title(_BASE_TITLE)
         self.root.geometry("1400x900")
         self.root.minsize(1200, 800)
         
         # Initialize managers
         self.file_manager = FileManager()
-        self.export_manager = ExportManager()
         self.canvas_manager = CanvasManager()
         self.app_settings = AppSettings()
         
         # Current file path
         self.current_file = None
         self.is_modified = False
+        self._title_update_pending = False
+        self._title_file = None
+        self._title_file_prefix = ""
+        self._last_title = None
         
         # Auto-save functionality
         self.auto_save_enabled = self.app_settings.get("editor.auto_save", True)
@@ -50,19 +73,26 @@ class MainWindow:
         self.auto_save_interval = auto_save_interval_setting if isinstance(auto_save_interval_setting, (int, float)) else 300
         self.auto_save_thread = None
         self.auto_save_running = False
-        self.last_auto_save_time = time.time()
+        self.last_auto_save_time = time.monotonic()
+        self._autosave_queue = queue.Queue(maxsize=1)
+        self._last_autosave_digest = None
+        self._autosave_stop = threading.Event()
+        self._state_lock = threading.Lock()  # Guards state read by the worker
         
         # Auto-save file path
         self.auto_save_dir = os.path.join(self.app_settings.settings_dir, "autosave")
-        os.makedirs(self.auto_save_dir, exist_ok=True)
+        self._autosave_dir_ready = False  # Created on the first auto-save
         self.auto_save_file = os.path.join(self.auto_save_dir, "autosave.json")
+        if compression.available:
+            self.auto_save_file = self._migrate_auto_save_file(self.auto_save_file + ".zst")
+        self._autosave_file_present = os.path.exists(self.auto_save_file)
         
         # Setup the UI
         self.setup_ui()
         self.setup_bindings()
         
-        # Check for auto-save recovery
-        self.check_auto_save_recovery()
+        # Check for auto-save recovery once the window has been drawn
+        self.root.after_idle(self.check_auto_save_recovery)
         
         # Start auto-save if enabled
         if self.auto_save_enabled:
@@ -109,19 +139,20 @@ class MainWindow:
     
     def setup_bindings(self):
         """Setup keyboard bindings and events"""
-        self.root.bind('<Control-n>', lambda e: self.new_file())
-        self.root.bind('<Control-o>', lambda e: self.open_file())
-        self.root.bind('<Control-s>', lambda e: self.save_file())
-        self.root.bind('<Control-S>', lambda e: self.save_as_file())
-        self.root.bind('<Control-e>', lambda e: self.export_design())
-        self.root.bind('<Control-z>', lambda e: self.undo())
-        self.root.bind('<Control-y>', lambda e: self.redo())
-        self.root.bind('<Delete>', lambda e: self.delete_selected())
+        # Handlers take an optional event, so bind them without a wrapper
+        self.root.bind('<Control-n>', self.new_file)
+        self.root.bind('<Control-o>', self.open_file)
+        self.root.bind('<Control-s>', self.save_file)
+        self.root.bind('<Control-S>', self.save_as_file)
+        self.root.bind('<Control-e>', self.export_design)
+        self.root.bind('<Control-z>', self.undo)
+        self.root.bind('<Control-y>', self.redo)
+        self.root.bind('<Delete>', self.delete_selected)
         
         # Window close event
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
     
-    def new_file(self):
+    def new_file(self, event=None):
         """Create a new design file"""
         if self.is_modified:
             if not self.confirm_discard_changes():
@@ -133,12 +164,13 @@ class MainWindow:
         self.update_title()
         self.properties_panel.clear_selection()
     
-    def open_file(self):
+    def open_file(self, event=None):
         """Open an existing design file"""
         if self.is_modified:
             if not self.confirm_discard_changes():
                 return
         
+        from tkinter import filedialog
         file_path = filedialog.askopenfilename(
             title="Open Design File",
             filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
@@ -155,7 +187,7 @@ class MainWindow:
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to open file: {e}")
     
-    def save_file(self):
+    def save_file(self, event=None):
         """Save the current design"""
         if self.current_file:
             try:
@@ -168,8 +200,9 @@ class MainWindow:
         else:
             self.save_as_file()
     
-    def save_as_file(self):
+    def save_as_file(self, event=None):
         """Save the current design with a new name"""
+        from tkinter import filedialog
         file_path = filedialog.asksaveasfilename(
             title="Save Design As",
             defaultextension=".json",
@@ -186,8 +219,9 @@ class MainWindow:
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to save file: {e}")
     
-    def export_design(self):
+    def export_design(self, event=None):
         """Export the design as PNG or SVG"""
+        from tkinter import filedialog
         file_path = filedialog.asksaveasfilename(
             title="Export Design",
             filetypes=[("PNG files", "*.png"), ("SVG files", "*.svg")]
@@ -195,27 +229,31 @@ class MainWindow:
         
         if file_path:
             try:
+                # Pillow is only needed for exporting, load it on first use
+                from utils.export_manager import ExportManager
+                export_manager = ExportManager()
+                
                 if file_path.lower().endswith('.png'):
-                    self.export_manager.export_png(self.design_canvas, file_path)
+                    export_manager.export_png(self.design_canvas, file_path)
                 elif file_path.lower().endswith('.svg'):
                     design_data = self.canvas_manager.get_design_data()
-                    self.export_manager.export_svg(design_data, file_path)
+                    export_manager.export_svg(design_data, file_path)
                 
                 messagebox.showinfo("Success", "Design exported successfully!")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to export design: {e}")
     
-    def undo(self):
+    def undo(self, event=None):
         """Undo the last action"""
         self.canvas_manager.undo()
         self.mark_modified()
     
-    def redo(self):
+    def redo(self, event=None):
         """Redo the last undone action"""
         self.canvas_manager.redo()
         self.mark_modified()
     
-    def delete_selected(self):
+    def delete_selected(self, event=None):
         """Delete the selected component"""
         if self.canvas_manager.selected_component:
             self.canvas_manager.delete_component(self.canvas_manager.selected_component)
@@ -260,10 +298,14 @@ class MainWindow:
         # Stop auto-save thread
         self.stop_auto_save()
         
+        # Write any settings change still waiting on the debounce timer
+        self.app_settings.flush()
+        
         # Clean up auto-save file if no unsaved changes
         if not self.is_modified and os.path.exists(self.auto_save_file):
             try:
                 os.remove(self.auto_save_file)
+                self._autosave_file_present = False
             except:
                 pass  # Ignore cleanup errors
         
@@ -273,12 +315,14 @@ class MainWindow:
         """Start the auto-save thread"""
         if not self.auto_save_running:
             self.auto_save_running = True
+            self._autosave_stop.clear()
             self.auto_save_thread = threading.Thread(target=self._auto_save_worker, daemon=True)
             self.auto_save_thread.start()
     
     def stop_auto_save(self):
         """Stop the auto-save thread"""
         self.auto_save_running = False
+        self._autosave_stop.set()
         if self.auto_save_thread and self.auto_save_thread.is_alive():
             self.auto_save_thread.join(timeout=1.0)
     
@@ -286,104 +330,273 @@ class MainWindow:
         """Auto-save worker thread"""
         while self.auto_save_running:
             try:
-                time.sleep(10)  # Check every 10 seconds
-                
-                if not self.auto_save_running:
+                # Sleep until the next save is due; returns early on stop
+                if self._autosave_stop.wait(timeout=self._compute_next_wait()):
                     break
                 
-                current_time = time.time()
-                time_since_last_save = current_time - self.last_auto_save_time
+                # Take a consistent view of the state the main thread mutates
+                with self._state_lock:
+                    modified = self.is_modified
+                    last_save_time = self.last_auto_save_time
+                    has_components = bool(self.canvas_manager.components)
+                
+                current_time = time.monotonic()
+                time_since_last_save = current_time - last_save_time
                 
                 # Only auto-save if there are modifications and enough time has passed
-                if (self.is_modified and 
+                if (modified and 
                     time_since_last_save >= float(self.auto_save_interval) and
-                    self.canvas_manager.components):  # Only save if there are components
+                    has_components):  # Only save if there are components
                     
-                    self.root.after(0, self._perform_auto_save)
-                    self.last_auto_save_time = current_time
+                    # Drop a snapshot left over from a cycle that timed out
+                    try:
+                        self._autosave_queue.get_nowait()
+                    except queue.Empty:
+                        pass
                     
-            except Exception as e:
-                print(f"Auto-save error: {e}")
+                    self.root.after(0, self._snapshot_for_autosave)
+                    with self._state_lock:
+                        self.last_auto_save_time = current_time
+                    
+                    try:
+                        design_data, original_file = self._autosave_queue.get(timeout=5.0)
+                    except queue.Empty:
+                        continue  # Main thread is busy, try again next cycle
+                    
+                    if self._autosave_stop.is_set():
+                        break
+                    
+                    if self._perform_auto_save(design_data, original_file):
+                        # Update title to show auto-save status
+                        self.root.after(0, self.update_title)
+                    
+            except Exception:
+                print("Auto-save error:")
+                traceback.print_exc()
                 continue
     
-    def _perform_auto_save(self):
-        """Perform the actual auto-save operation (runs on main thread)"""
+    def _compute_next_wait(self):
+        """Seconds until the next auto-save is due"""
+        elapsed = time.monotonic() - self.last_auto_save_time
+        return max(1.0, float(self.auto_save_interval) - elapsed)
+    
+    def _snapshot_for_autosave(self):
+        """Capture the design for the auto-save worker (runs on main thread)"""
+        # The component dicts are the components' cached to_dict() results, shared
+        # with later saves; a change builds a new dict rather than editing the
+        # old one, so the worker can read them, but it must never modify them
+        try:
+            self._autosave_queue.put_nowait(
+                (self.canvas_manager.get_design_data(), self.current_file)
+            )
+        except queue.Full:
+            pass
+    
+    def _perform_auto_save(self, design_data, original_file):
+        """Serialize and write the auto-save file (runs on the worker thread)"""
         try:
-            design_data = self.canvas_manager.get_design_data()
+            # Nobody reads the auto-save file by hand, so skip indentation
+            design_bytes = json_io.dumps(design_data)
+            
+            # Skip the write when nothing changed since the last auto-save
+            digest = hashlib.blake2b(design_bytes, digest_size=16)
+            digest.update(json_io.dumps(original_file))
+            digest = digest.digest()
+            if digest == self._last_autosave_digest:
+                return False
             
             # Add metadata for auto-save
-            auto_save_data = {
-                "metadata": {
-                    "version": "1.0",
-                    "auto_save": True,
-                    "original_file": self.current_file,
-                    "timestamp": time.time(),
-                    "app_name": "Mini Figma - UI Wireframe Designer"
-                },
-                "design": design_data
+            metadata = {
+                **_AUTOSAVE_META_TEMPLATE,
+                "original_file": original_file,
+                "timestamp": time.time()
             }
             
-            # Save to auto-save file
-            with open(self.auto_save_file, 'w', encoding='utf-8') as f:
-                json.dump(auto_save_data, f, indent=2, ensure_ascii=False)
+            # Splice the already encoded design into the payload
+            data = b''.join((
+                b'{"metadata":', json_io.dumps(metadata),
+                b',"design":', design_bytes, b'}'
+            ))
             
-            # Update title to show auto-save status
-            self.update_title()
+            # Save to auto-save file
+            self._write_auto_save_file(compression.compress(data))
+            self._last_autosave_digest = digest
+            self._autosave_file_present = True
+            return True
             
         except Exception as e:
             print(f"Auto-save failed: {e}")
+            return False
+    
+    def _migrate_auto_save_file(self, compressed_file):
+        """Carry an uncompressed auto-save over to the compressed file name"""
+        # Recovery sniffs the content, so the old file can simply be renamed
+        if not os.path.exists(compressed_file) and os.path.exists(self.auto_save_file):
+            try:
+                os.replace(self.auto_save_file, compressed_file)
+            except OSError:
+                return self.auto_save_file
+        return compressed_file
+    
+    def _write_auto_save_file(self, data):
+        """Atomically replace the auto-save file with the given bytes"""
+        # Write next to the target and swap it in, so a crash mid-write
+        # never destroys the previous recovery file
+        if not self._autosave_dir_ready:
+            os.makedirs(self.auto_save_dir, exist_ok=True)
+            self._autosave_dir_ready = True
+        
+        temp_file = self.auto_save_file + ".tmp"
+        try:
+            if not self._write_direct(temp_file, data):
+                with open(temp_file, 'wb', buffering=1024 * 1024) as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(temp_file, self.auto_save_file)
+        except OSError:
+            try:
+                os.remove(temp_file)
+            except OSError:
+                pass
+            raise
+    
+    def _write_direct(self, path, data):
+        """Write a large payload with O_DIRECT; return False to fall back"""
+        if len(data) < _DIRECT_WRITE_THRESHOLD or not hasattr(os, 'O_DIRECT'):
+            return False
+        
+        # O_DIRECT needs an aligned buffer and length; anonymous mmap memory
+        # is page aligned, and the padding is truncated off afterwards
+        size = -(-len(data) // _DIRECT_WRITE_ALIGN) * _DIRECT_WRITE_ALIGN
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_DIRECT, 0o644)
+        except OSError:
+            return False  # Filesystem does not support O_DIRECT
+        
+        try:
+            with mmap.mmap(-1, size) as buf:
+                buf[:len(data)] = data
+                view = memoryview(buf)
+                try:
+                    written = 0
+                    while written < size:
+                        written += os.write(fd, view[written:])
+                except OSError:
+                    return False
+                finally:
+                    view.release()
+            os.ftruncate(fd, len(data))
+            os.fsync(fd)
+            return True
+        finally:
+            os.close(fd)
     
     def check_auto_save_recovery(self):
         """Check if there's an auto-save file to recover"""
-        if os.path.exists(self.auto_save_file):
-            try:
-                with open(self.auto_save_file, 'r', encoding='utf-8') as f:
-                    auto_save_data = json.load(f)
-                
+        # Opening directly doubles as the existence check
+        try:
+            raw = self._read_auto_save_bytes()
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            print(f"Auto-save recovery error: {e}")
+            return
+        
+        try:
+            raw = compression.decompress(raw)
+            
+            # Only the small metadata block is needed to decide whether to
+            # prompt; the design itself is parsed once the user accepts
+            auto_save_data = None
+            metadata = self._read_auto_save_metadata(raw)
+            if metadata is None:
+                auto_save_data = json_io.loads(raw)
                 metadata = auto_save_data.get("metadata", {})
-                if metadata.get("auto_save"):
-                    # Show recovery dialog
-                    result = messagebox.askyesno(
-                        "Auto-save Recovery",
-                        "An auto-saved file was found. This might contain unsaved work from a previous session.\n\n"
-                        "Would you like to recover it?",
-                        icon="question"
-                    )
+            
+            if metadata.get("auto_save"):
+                # Show recovery dialog
+                result = messagebox.askyesno(
+                    "Auto-save Recovery",
+                    "An auto-saved file was found. This might contain unsaved work from a previous session.\n\n"
+                    "Would you like to recover it?",
+                    icon="question"
+                )
+                
+                if result:
+                    # Load the auto-saved design
+                    if auto_save_data is None:
+                        auto_save_data = json_io.loads(raw)
+                    design_data = auto_save_data.get("design", {})
+                    self.canvas_manager.load_design(design_data)
                     
-                    if result:
-                        # Load the auto-saved design
-                        design_data = auto_save_data.get("design", {})
-                        self.canvas_manager.load_design(design_data)
-                        
-                        # Set as modified and update title
-                        original_file = metadata.get("original_file")
-                        if original_file and os.path.exists(original_file):
-                            self.current_file = original_file
-                        
-                        self.is_modified = True
-                        self.update_title()
-                        
-                        messagebox.showinfo(
-                            "Recovery Complete",
-                            "Your work has been recovered from the auto-save file."
-                        )
-                    else:
-                        # User declined recovery, remove auto-save file
-                        os.remove(self.auto_save_file)
-                        
-            except Exception as e:
-                print(f"Auto-save recovery error: {e}")
-                # If recovery fails, remove the corrupted auto-save file
-                try:
+                    # Set as modified and update title
+                    original_file = metadata.get("original_file")
+                    if original_file and os.path.exists(original_file):
+                        self.current_file = original_file
+                    
+                    self.is_modified = True
+                    self.update_title()
+                    
+                    messagebox.showinfo(
+                        "Recovery Complete",
+                        "Your work has been recovered from the auto-save file."
+                    )
+                else:
+                    # User declined recovery, remove auto-save file
                     os.remove(self.auto_save_file)
-                except:
-                    pass
+                    self._autosave_file_present = False
+                    
+        except Exception as e:
+            print(f"Auto-save recovery error: {e}")
+            # If recovery fails, remove the corrupted auto-save file
+            try:
+                os.remove(self.auto_save_file)
+                self._autosave_file_present = False
+            except:
+                pass
+    
+    def _read_auto_save_bytes(self):
+        """Read the whole auto-save file with a single open"""
+        fd = os.open(self.auto_save_file, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+        try:
+            # Size the read from the open descriptor, no separate stat needed
+            remaining = os.fstat(fd).st_size
+            chunks = []
+            while remaining > 0:
+                chunk = os.read(fd, remaining)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                remaining -= len(chunk)
+            return b''.join(chunks)
+        finally:
+            os.close(fd)
+    
+    def _read_auto_save_metadata(self, raw):
+        """Parse only the leading metadata object of an auto-save payload"""
+        match = _METADATA_PREFIX.match(raw)
+        if not match:
+            return None
+        
+        # Metadata is tiny, so a bounded prefix of the file is enough
+        chunk = raw[match.end():match.end() + 4096]
+        try:
+            head = chunk.decode('utf-8')
+        except UnicodeDecodeError as e:
+            head = chunk[:e.start].decode('utf-8')
+        
+        try:
+            metadata, _ = json.JSONDecoder().raw_decode(head.lstrip())
+        except ValueError:
+            return None  # Prefix too short or unusual layout, parse it all
+        return metadata if isinstance(metadata, dict) else None
     
     def toggle_auto_save(self):
         """Toggle auto-save functionality"""
         self.auto_save_enabled = not self.auto_save_enabled
         self.app_settings.set("editor.auto_save", self.auto_save_enabled)
-        self.app_settings.save_settings()
+        self.app_settings.schedule_save()
         
         if self.auto_save_enabled:
             self.start_auto_save()
@@ -396,29 +609,46 @@ class MainWindow:
         """Set auto-save interval in minutes"""
         self.auto_save_interval = interval_minutes * 60  # Convert to seconds
         self.app_settings.set("editor.auto_save_interval", self.auto_save_interval)
-        self.app_settings.save_settings()
+        self.app_settings.schedule_save()
     
     def mark_modified(self):
         """Mark the design as modified"""
-        self.is_modified = True
+        with self._state_lock:
+            self.is_modified = True
+            # Reset auto-save timer when content is modified
+            self.last_auto_save_time = time.monotonic()
+        
+        # Coalesce title updates from bursts of edits into one per idle cycle
+        if not self._title_update_pending:
+            self._title_update_pending = True
+            self.root.after_idle(self._flush_title)
+    
+    def _flush_title(self):
+        """Apply a title update scheduled by mark_modified"""
+        self._title_update_pending = False
         self.update_title()
-        # Reset auto-save timer when content is modified
-        self.last_auto_save_time = time.time()
     
     def update_title(self):
         """Update the window title"""
-        title = "Mini Figma - UI Wireframe Designer"
-        if self.current_file:
-            filename = os.path.basename(self.current_file)
-            title = f"{filename} - {title}"
-        if self.is_modified:
-            title = f"*{title}"
+        # The file name part only changes when a different file is opened
+        if self.current_file != self._title_file:
+            self._title_file = self.current_file
+            self._title_file_prefix = (
+                os.path.basename(self.current_file) + " - " if self.current_file else ""
+            )
         
         # Add auto-save indicator if auto-save is enabled
-        if self.auto_save_enabled and os.path.exists(self.auto_save_file):
-            title += " [Auto-saved]"
-            
-        self.root.title(title)
+        title = ''.join((
+            "*" if self.is_modified else "",
+            self._title_file_prefix,
+            _BASE_TITLE,
+            " [Auto-saved]" if self.auto_save_enabled and self._autosave_file_present else ""
+        ))
+        
+        # Skip the Tk round trip when nothing visible changed
+        if title != self._last_title:
+            self._last_title = title
+            self.root.title(title)
 
     def run(self):
         """Start the application"""
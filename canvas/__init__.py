@@ -2,7 +2,15 @@
 Canvas module initialization
 """
 
-from .design_canvas import DesignCanvas
-from .canvas_manager import CanvasManager
-
 __all__ = ['DesignCanvas', 'CanvasManager']
+
+
+def __getattr__(name):
+    # Import submodules on first access so importing one does not load both
+    if name == 'DesignCanvas':
+        from .design_canvas import DesignCanvas
+        return DesignCanvas
+    if name == 'CanvasManager':
+        from .canvas_manager import CanvasManager
+        return CanvasManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
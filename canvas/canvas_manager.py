@@ -2,11 +2,321 @@
 Canvas manager for handling component operations
 """
 
-from components.rectangle import RectangleComponent
-from components.button import ButtonComponent
-from components.input_field import InputFieldComponent
-from components.text_label import TextLabelComponent
-from components.group import GroupComponent
+from abc import ABC, abstractmethod
+from collections import deque
+import importlib
+from itertools import accumulate
+from operator import attrgetter
+
+# Component factory: type -> (module, class), imported on first use
+COMPONENT_TYPES = {
+    'rectangle': ('components.rectangle', 'RectangleComponent'),
+    'button': ('components.button', 'ButtonComponent'),
+    'input': ('components.input_field', 'InputFieldComponent'),
+    'text': ('components.text_label', 'TextLabelComponent'),
+    'group': ('components.group', 'GroupComponent')
+}
+
+class _QuadNode:
+    """Node of a Quadtree covering one rectangular region"""
+    
+    __slots__ = ('x0', 'y0', 'x1', 'y1', 'depth', 'items', 'children')
+    
+    def __init__(self, x0, y0, x1, y1, depth):
+        self.x0, self.y0, self.x1, self.y1 = x0, y0, x1, y1
+        self.depth = depth
+        self.items = []
+        self.children = None
+    
+    def child_for_box(self, box):
+        """Return the child that fully contains box, if any"""
+        mx = (self.x0 + self.x1) / 2
+        my = (self.y0 + self.y1) / 2
+        bx0, by0, bx1, by1 = box
+        if bx0 < self.x0 or by0 < self.y0 or bx1 > self.x1 or by1 > self.y1:
+            return None
+        if bx1 < mx:
+            col = 0
+        elif bx0 >= mx:
+            col = 1
+        else:
+            return None
+        if by1 < my:
+            row = 0
+        elif by0 >= my:
+            row = 2
+        else:
+            return None
+        return self.children[row + col]
+    
+    def child_for_point(self, x, y):
+        """Return the child whose region contains the point, if any"""
+        if not (self.x0 <= x <= self.x1 and self.y0 <= y <= self.y1):
+            return None
+        mx = (self.x0 + self.x1) / 2
+        my = (self.y0 + self.y1) / 2
+        return self.children[(2 if y >= my else 0) + (1 if x >= mx else 0)]
+    
+    def split(self):
+        """Create the four child regions"""
+        mx = (self.x0 + self.x1) / 2
+        my = (self.y0 + self.y1) / 2
+        depth = self.depth + 1
+        self.children = [
+            _QuadNode(self.x0, self.y0, mx, my, depth),
+            _QuadNode(mx, self.y0, self.x1, my, depth),
+            _QuadNode(self.x0, my, mx, self.y1, depth),
+            _QuadNode(mx, my, self.x1, self.y1, depth)
+        ]
+
+class Quadtree:
+    """Spatial index of component bounding boxes for point queries"""
+    
+    def __init__(self, bounds=(-4096, -4096, 8192, 8192), capacity=8, max_depth=6):
+        """Initialize an empty quadtree over bounds (x0, y0, x1, y1)"""
+        self.bounds = bounds
+        self.capacity = capacity
+        self.max_depth = max_depth
+        self.version = 0  # Bumped whenever a query could return a different result
+        self._boxes = {}
+        self.clear()
+    
+    def clear(self):
+        """Remove every component from the index"""
+        for component in self._boxes:
+            component._spatial_index = None
+        self._root = _QuadNode(*self.bounds, 0)
+        self._nodes = {}  # Component -> node holding it
+        self._boxes = {}  # Component -> (x0, y0, x1, y1) it was indexed with
+        self._moved = set()  # Components whose box is stale
+        self.version += 1
+    
+    def insert(self, component):
+        """Add a component to the index"""
+        component._spatial_index = self
+        self.version += 1
+        
+        # A group's bounds always enclose its children, so groups are indexed
+        # by their box like any other component
+        box = (component.x, component.y,
+               component.x + component.width, component.y + component.height)
+        self._boxes[component] = box
+        
+        node = self._root
+        while node.children is not None:
+            child = node.child_for_box(box)
+            if child is None:
+                break
+            node = child
+        self._place(node, component)
+    
+    def remove(self, component):
+        """Remove a component from the index"""
+        self.version += 1
+        if component._spatial_index is self:
+            component._spatial_index = None
+        self._moved.discard(component)
+        self._boxes.pop(component, None)
+        node = self._nodes.pop(component, None)
+        if node is not None:
+            node.items.remove(component)
+    
+    def update(self, component):
+        """Re-index a component whose bounds changed"""
+        self.remove(component)
+        self.insert(component)
+    
+    def mark_moved(self, component):
+        """Note that a component's bounds changed; re-indexed on next query"""
+        self.version += 1
+        if component in self._boxes:
+            self._moved.add(component)
+    
+    def query_point(self, x, y):
+        """Return components whose indexed box contains the point"""
+        if self._moved:
+            moved, self._moved = self._moved, set()
+            for component in moved:
+                self.update(component)
+        
+        result = []
+        node = self._root
+        while node is not None:
+            for component in node.items:
+                bx0, by0, bx1, by1 = self._boxes[component]
+                if bx0 <= x <= bx1 and by0 <= y <= by1:
+                    result.append(component)
+            node = node.child_for_point(x, y) if node.children is not None else None
+        return result
+    
+    def _place(self, node, component):
+        """Store a component in node, splitting it when it overflows"""
+        node.items.append(component)
+        self._nodes[component] = node
+        
+        if (node.children is None and len(node.items) > self.capacity and
+                node.depth < self.max_depth):
+            node.split()
+            items, node.items = node.items, []
+            for item in items:
+                child = node.child_for_box(self._boxes[item])
+                target = child if child is not None else node
+                target.items.append(item)
+                self._nodes[item] = target
+
+class Change(ABC):
+    """One reversible edit recorded in the undo trail"""
+    
+    @abstractmethod
+    def undo(self, manager):
+        """Revert the edit"""
+    
+    @abstractmethod
+    def redo(self, manager):
+        """Apply the edit again"""
+
+class AddChange(Change):
+    """A component inserted into the components list"""
+    
+    def __init__(self, component, index):
+        self.component = component
+        self.index = index
+    
+    def undo(self, manager):
+        manager._detach(self.component)
+    
+    def redo(self, manager):
+        manager._attach(self.component, self.index)
+
+class RemoveChange(AddChange):
+    """A component removed from the components list"""
+    
+    def undo(self, manager):
+        AddChange.redo(self, manager)
+    
+    def redo(self, manager):
+        AddChange.undo(self, manager)
+
+class MoveChange(Change):
+    """A component moved by an offset"""
+    
+    def __init__(self, component, dx, dy):
+        self.component = component
+        self.dx = dx
+        self.dy = dy
+    
+    def undo(self, manager):
+        self.component.move(-self.dx, -self.dy)
+        manager._redraw(self.component)
+    
+    def redo(self, manager):
+        self.component.move(self.dx, self.dy)
+        manager._redraw(self.component)
+
+class ResizeChange(Change):
+    """A component resized"""
+    
+    def __init__(self, component, old_size, new_size):
+        self.component = component
+        self.old_size = old_size
+        self.new_size = new_size
+    
+    def undo(self, manager):
+        self.component.resize(*self.old_size)
+        manager._redraw(self.component)
+    
+    def redo(self, manager):
+        self.component.resize(*self.new_size)
+        manager._redraw(self.component)
+
+class PositionChange(Change):
+    """A component placed at a new position"""
+    
+    def __init__(self, component, old_position, new_position):
+        self.component = component
+        self.old_position = old_position
+        self.new_position = new_position
+    
+    def undo(self, manager):
+        self.component.set_position(*self.old_position)
+        manager._redraw(self.component)
+    
+    def redo(self, manager):
+        self.component.set_position(*self.new_position)
+        manager._redraw(self.component)
+
+class PropertyChange(Change):
+    """Component attributes set to new values"""
+    
+    def __init__(self, component, old_values, new_values):
+        self.component = component
+        self.old_values = old_values
+        self.new_values = new_values
+    
+    def undo(self, manager):
+        self.component.set_properties(**self.old_values)
+        manager._redraw(self.component)
+    
+    def redo(self, manager):
+        self.component.set_properties(**self.new_values)
+        manager._redraw(self.component)
+
+class UngroupChange(Change):
+    """A group's children released by ungrouping"""
+    
+    def __init__(self, group, children):
+        self.group = group
+        self.children = children
+    
+    def undo(self, manager):
+        self.group.set_children(self.children)
+    
+    def redo(self, manager):
+        self.group.ungroup()
+
+class Trail:
+    """Undo history stored as a trail of changes, one node per action"""
+    
+    def __init__(self, max_nodes=50):
+        """Initialize an empty trail"""
+        self.max_nodes = max_nodes
+        # A bounded deque drops the oldest action in O(1) once full
+        self.nodes = deque(maxlen=max_nodes)
+        self.redo_nodes = []
+    
+    def new_node(self):
+        """Start recording a new undoable action"""
+        self.nodes.append([])
+        self.redo_nodes.clear()
+    
+    def push(self, change):
+        """Record a change in the current node"""
+        self.nodes[-1].append(change)
+    
+    def undo(self, manager):
+        """Revert the most recent node; return False if there is none"""
+        if not self.nodes:
+            return False
+        node = self.nodes.pop()
+        for change in reversed(node):
+            change.undo(manager)
+        self.redo_nodes.append(node)
+        return True
+    
+    def redo(self, manager):
+        """Apply the most recently undone node; return False if there is none"""
+        if not self.redo_nodes:
+            return False
+        node = self.redo_nodes.pop()
+        for change in node:
+            change.redo(manager)
+        self.nodes.append(node)
+        return True
+    
+    def clear(self):
+        """Forget all history"""
+        self.nodes.clear()
+        self.redo_nodes.clear()
 
 class CanvasManager:
     """Manages components on the design canvas"""
@@ -18,19 +328,28 @@ class CanvasManager:
         self.selected_components = []  # For multi-selection
         self.canvas = None
         
+        # Spatial index for hit testing, plus each component's draw order
+        self.spatial_index = Quadtree()
+        self._draw_order = None
+        self._by_id = {}
+        self._hit_cache = None  # ((x, y, index version), component)
+        
         # Undo/Redo system
-        self.history = []
-        self.history_index = -1
         self.max_history = 50
+        self.trail = Trail(self.max_history)
+        self._needs_full_redraw = False
         
-        # Component factory
-        self.component_classes = {
-            'rectangle': RectangleComponent,
-            'button': ButtonComponent,
-            'input': InputFieldComponent,
-            'text': TextLabelComponent,
-            'group': GroupComponent
-        }
+        # Component classes resolved so far from COMPONENT_TYPES
+        self.component_classes = {}
+    
+    def get_component_class(self, component_type):
+        """Get the class for a component type, importing it on first use"""
+        component_class = self.component_classes.get(component_type)
+        if component_class is None and component_type in COMPONENT_TYPES:
+            module_name, class_name = COMPONENT_TYPES[component_type]
+            component_class = getattr(importlib.import_module(module_name), class_name)
+            self.component_classes[component_type] = component_class
+        return component_class
     
     def set_canvas(self, canvas):
         """Set the design canvas reference"""
@@ -38,18 +357,18 @@ class CanvasManager:
     
     def add_component(self, component_type, x=100, y=100):
         """Add a new component to the canvas"""
-        if component_type not in self.component_classes:
+        component_class = self.get_component_class(component_type)
+        if component_class is None:
             return None
         
-        # Save state for undo
-        self._save_state()
-        
         # Create component
-        component_class = self.component_classes[component_type]
         component = component_class(x, y)
         
         # Add to components list
+        self.trail.new_node()
+        self.trail.push(AddChange(component, len(self.components)))
         self.components.append(component)
+        self._index_add(component)
         
         # Draw on canvas
         if self.canvas:
@@ -59,30 +378,20 @@ class CanvasManager:
     
     def delete_component(self, component):
         """Delete a component from the canvas"""
-        if component in self.components:
-            # Save state for undo
-            self._save_state()
-            
-            # Remove from canvas
-            if self.canvas:
-                component.delete_from_canvas(self.canvas.canvas)
-            
-            # Remove from components list
-            self.components.remove(component)
-            
-            # Clear selection if this was selected
-            if self.selected_component == component:
-                self.selected_component = None
+        if self._contains(component):
+            self.trail.new_node()
+            self.trail.push(RemoveChange(component, self.components.index(component)))
+            self._detach(component)
     
     def duplicate_component(self, component):
         """Duplicate a component"""
-        if component in self.components:
-            # Save state for undo
-            self._save_state()
-            
+        if self._contains(component):
             # Create clone
             clone = component.clone()
+            self.trail.new_node()
+            self.trail.push(AddChange(clone, len(self.components)))
             self.components.append(clone)
+            self._index_add(clone)
             
             # Draw on canvas
             if self.canvas:
@@ -93,54 +402,146 @@ class CanvasManager:
     
     def select_component(self, component):
         """Select a component"""
-        # Deselect previous component
+        # Deselect previous component; only the handles are repainted
         if self.selected_component:
-            self.selected_component.deselect()
             if self.canvas:
-                self.selected_component.draw(self.canvas.canvas)
+                self.selected_component.hide_selection_handles(self.canvas.canvas)
+            else:
+                self.selected_component.deselect()
         
         # Select new component
         self.selected_component = component
         if component:
-            component.select()
             if self.canvas:
-                component.draw(self.canvas.canvas)
+                component.show_selection_handles(self.canvas.canvas)
+            else:
+                component.select()
     
     def clear_selection(self):
         """Clear component selection"""
         if self.selected_component:
-            self.selected_component.deselect()
             if self.canvas:
-                self.selected_component.draw(self.canvas.canvas)
+                self.selected_component.hide_selection_handles(self.canvas.canvas)
+            else:
+                self.selected_component.deselect()
             self.selected_component = None
     
     def get_component_at_position(self, x, y):
         """Get component at the given position"""
-        # Check components in reverse order (top to bottom)
-        for component in reversed(self.components):
-            if component.is_point_inside(x, y):
-                return component
-        return None
+        # Repeated queries at the same point, e.g. the two clicks of a
+        # double-click, reuse the answer until the index changes
+        key = (x, y, self.spatial_index.version)
+        if self._hit_cache is not None and self._hit_cache[0] == key:
+            return self._hit_cache[1]
+        
+        # Only test components whose box contains the point, topmost first
+        candidates = self.spatial_index.query_point(x, y)
+        key = (x, y, self.spatial_index.version)  # The query may re-index moved components
+        if not candidates:
+            self._hit_cache = (key, None)
+            return None
+        
+        if self._draw_order is None:
+            self._draw_order = {component: i for i, component in enumerate(self.components)}
+        order = self._draw_order
+        
+        hit = None
+        for component in candidates:
+            if (component in order and component.is_point_inside(x, y) and
+                    (hit is None or order[component] > order[hit])):
+                hit = component
+        
+        self._hit_cache = (key, hit)
+        return hit
+    
+    def _index_add(self, component):
+        """Track a component added to the components list"""
+        self.spatial_index.insert(component)
+        self._by_id[component.id] = component
+        self._draw_order = None
+    
+    def _index_remove(self, component):
+        """Stop tracking a component removed from the components list"""
+        self.spatial_index.remove(component)
+        if self._by_id.get(component.id) is component:
+            del self._by_id[component.id]
+        self._draw_order = None
+    
+    def _index_reset(self):
+        """Rebuild the spatial index from the components list"""
+        self.spatial_index.clear()
+        self._by_id = {}
+        for component in self.components:
+            self.spatial_index.insert(component)
+            self._by_id[component.id] = component
+        self._draw_order = None
+    
+    def _contains(self, component):
+        """Check whether a component is on the canvas, O(1) in the common case"""
+        # Fall back to a scan so components sharing an id (e.g. from a
+        # hand-edited file) are still found
+        return self._by_id.get(component.id) is component or component in self.components
+    
+    def get_component_by_id(self, component_id):
+        """Get a component on the canvas by its id"""
+        return self._by_id.get(component_id)
     
     def move_component(self, component, dx, dy):
         """Move a component by the given offset"""
-        if component in self.components:
+        if self._contains(component):
+            self.trail.new_node()
+            self.trail.push(MoveChange(component, dx, dy))
             component.move(dx, dy)
             if self.canvas:
-                component.draw(self.canvas.canvas)
+                component.redraw(self.canvas.canvas)
     
     def resize_component(self, component, width, height):
         """Resize a component"""
-        if component in self.components:
+        if self._contains(component):
+            old_size = (component.width, component.height)
             component.resize(width, height)
+            self.trail.new_node()
+            self.trail.push(ResizeChange(component, old_size, (component.width, component.height)))
+            if self.canvas:
+                component.draw(self.canvas.canvas)
+    
+    def record_geometry(self, component, old_position, old_size):
+        """Record a finished move or resize as one action; return whether anything changed"""
+        changes = []
+        new_size = (component.width, component.height)
+        if new_size != old_size:
+            changes.append(ResizeChange(component, old_size, new_size))
+        new_position = (component.x, component.y)
+        if new_position != old_position:
+            changes.append(PositionChange(component, old_position, new_position))
+        
+        if changes and self._contains(component):
+            self.trail.new_node()
+            for change in changes:
+                self.trail.push(change)
+            return True
+        return False
+    
+    def set_component_properties(self, component, **values):
+        """Set component attributes as one undoable action and redraw"""
+        old_values = {name: getattr(component, name) for name in values}
+        if old_values == values:
+            return
+        
+        component.set_properties(**values)
+        if self._contains(component):
+            self.trail.new_node()
+            self.trail.push(PropertyChange(component, old_values, values))
             if self.canvas:
                 component.draw(self.canvas.canvas)
     
     def clear_canvas(self):
         """Clear all components from canvas"""
-        # Save state for undo
+        # Record removals last to first so undo restores the original order
         if self.components:
-            self._save_state()
+            self.trail.new_node()
+            for index in range(len(self.components) - 1, -1, -1):
+                self.trail.push(RemoveChange(self.components[index], index))
         
         # Clear components
         for component in self.components:
@@ -148,13 +549,15 @@ class CanvasManager:
                 component.delete_from_canvas(self.canvas.canvas)
         
         self.components.clear()
+        self._index_reset()
         self.selected_component = None
     
     def get_design_data(self):
         """Get design data for saving"""
         return {
             'version': '1.0',
-            'components': [component.to_dict() for component in self.components]
+            # Unchanged components reuse their last serialized dict
+            'components': [component.get_cached_dict() for component in self.components]
         }
     
     def load_design(self, design_data):
@@ -166,70 +569,72 @@ class CanvasManager:
         components_data = design_data.get('components', [])
         for comp_data in components_data:
             component_type = comp_data.get('type')
-            if component_type in self.component_classes:
-                component_class = self.component_classes[component_type]
+            component_class = self.get_component_class(component_type)
+            if component_class is not None:
                 component = component_class()
                 component.from_dict(comp_data)
                 self.components.append(component)
+                self._index_add(component)
                 
                 if self.canvas:
                     component.draw(self.canvas.canvas)
         
         # Clear history since we loaded a new design
-        self.history.clear()
-        self.history_index = -1
-    
-    def _save_state(self):
-        """Save current state for undo system"""
-        # Remove any states after current index
-        self.history = self.history[:self.history_index + 1]
-        
-        # Add current state
-        current_state = self.get_design_data()
-        self.history.append(current_state)
-        
-        # Limit history size
-        if len(self.history) > self.max_history:
-            self.history.pop(0)
-        else:
-            self.history_index += 1
+        self.trail.clear()
     
     def undo(self):
         """Undo the last action"""
-        if self.history_index > 0:
-            self.history_index -= 1
-            state = self.history[self.history_index]
-            self._restore_state(state)
+        self._replay(self.trail.undo)
     
     def redo(self):
         """Redo the last undone action"""
-        if self.history_index < len(self.history) - 1:
-            self.history_index += 1
-            state = self.history[self.history_index]
-            self._restore_state(state)
-    
-    def _restore_state(self, state):
-        """Restore canvas to a previous state"""
-        # Clear current components
-        for component in self.components:
-            if self.canvas:
-                component.delete_from_canvas(self.canvas.canvas)
+        self._replay(self.trail.redo)
+    
+    def _replay(self, step):
+        """Apply one trail step, then redraw if stacking order changed"""
+        self._needs_full_redraw = False
+        step(self)
+        if self._needs_full_redraw and self.canvas:
+            self.canvas.redraw_all_components()
+        self._needs_full_redraw = False
+    
+    def _attach(self, component, index):
+        """Put a component back into the components list at index"""
+        self.components.insert(index, component)
+        self._index_add(component)
         
-        self.components.clear()
-        self.selected_component = None
+        if self.canvas:
+            if index == len(self.components) - 1:
+                component.draw(self.canvas.canvas)
+            else:
+                self._needs_full_redraw = True  # Must sit below later items
+    
+    def _detach(self, component):
+        """Take a component off the canvas and out of the components list"""
+        if self.canvas:
+            component.delete_from_canvas(self.canvas.canvas)
         
-        # Load state
-        components_data = state.get('components', [])
-        for comp_data in components_data:
-            component_type = comp_data.get('type')
-            if component_type in self.component_classes:
-                component_class = self.component_classes[component_type]
-                component = component_class()
-                component.from_dict(comp_data)
-                self.components.append(component)
-                
-                if self.canvas:
-                    component.draw(self.canvas.canvas)
+        self.components.remove(component)
+        self._index_remove(component)
+        
+        # Clear selection if this was selected
+        if self.selected_component == component:
+            self.selected_component = None
+    
+    def _redraw(self, component):
+        """Redraw a component changed by undo or redo"""
+        if self.canvas and self._contains(component):
+            component.redraw(self.canvas.canvas)
+    
+    def _record_positions(self, components, old_positions):
+        """Record position changes made by align or distribute; return the moved components"""
+        moved = []
+        for component, old_position in zip(components, old_positions):
+            new_position = (component.x, component.y)
+            if new_position != old_position:
+                self.trail.push(PositionChange(component, old_position, new_position))
+                moved.append(component)
+        return moved
     
     def align_components(self, alignment_type):
         """Align selected components"""
@@ -242,8 +647,9 @@ class CanvasManager:
         if not components_to_align:
             return
         
-        # Save state for undo
-        self._save_state()
+        # Remember positions for undo
+        self.trail.new_node()
+        old_positions = [(comp.x, comp.y) for comp in components_to_align]
         
         if alignment_type == "left":
             leftmost_x = min(comp.x for comp in components_to_align)
@@ -275,20 +681,23 @@ class CanvasManager:
             for comp in components_to_align:
                 comp.set_position(comp.x, avg_y - comp.height // 2)
         
-        # Redraw all components
+        moved = self._record_positions(components_to_align, old_positions)
+        
+        # Redraw only the components that actually moved
         if self.canvas:
-            for comp in components_to_align:
-                comp.draw(self.canvas.canvas)
+            for comp in moved:
+                comp.redraw(self.canvas.canvas)
     
     def distribute_components(self, distribution_type):
         """Distribute components evenly"""
         if len(self.components) < 3:
             return
         
-        # Save state for undo
-        self._save_state()
+        components_to_distribute = sorted(self.components, key=attrgetter('x' if distribution_type == "horizontal" else 'y'))
         
-        components_to_distribute = sorted(self.components, key=lambda c: c.x if distribution_type == "horizontal" else c.y)
+        # Remember positions for undo
+        self.trail.new_node()
+        old_positions = [(comp.x, comp.y) for comp in components_to_distribute]
         
         if distribution_type == "horizontal":
             first_x = components_to_distribute[0].x
@@ -300,11 +709,14 @@ class CanvasManager:
             available_space = total_width - component_widths
             spacing = available_space / (len(components_to_distribute) - 1)
             
-            # Position components
-            current_x = first_x
-            for comp in components_to_distribute:
-                comp.set_position(current_x, comp.y)
-                current_x += comp.width + spacing
+            # Position components, leaving ones already in place untouched
+            positions = accumulate(
+                (comp.width + spacing for comp in components_to_distribute[:-1]),
+                initial=first_x
+            )
+            for comp, new_x in zip(components_to_distribute, positions):
+                if comp.x != new_x:
+                    comp.set_position(new_x, comp.y)
         
         elif distribution_type == "vertical":
             first_y = components_to_distribute[0].y
@@ -316,16 +728,21 @@ class CanvasManager:
             available_space = total_height - component_heights
             spacing = available_space / (len(components_to_distribute) - 1)
             
-            # Position components
-            current_y = first_y
-            for comp in components_to_distribute:
-                comp.set_position(comp.x, current_y)
-                current_y += comp.height + spacing
-        
-        # Redraw all components
+            # Position components, leaving ones already in place untouched
+            positions = accumulate(
+                (comp.height + spacing for comp in components_to_distribute[:-1]),
+                initial=first_y
+            )
+            for comp, new_y in zip(components_to_distribute, positions):
+                if comp.y != new_y:
+                    comp.set_position(comp.x, new_y)
+        
+        moved = self._record_positions(components_to_distribute, old_positions)
+        
+        # Redraw only the components that actually moved
         if self.canvas:
-            for comp in components_to_distribute:
-                comp.draw(self.canvas.canvas)
+            for comp in moved:
+                comp.redraw(self.canvas.canvas)
     
     def add_to_selection(self, component):
         """Add a component to the multi-selection"""
@@ -350,28 +767,29 @@ class CanvasManager:
         if len(self.selected_components) < 2:
             return None
         
-        self._save_state()
+        self.trail.new_node()
         
         # Create group from selected components
         components_to_group = self.selected_components.copy()
-        group = GroupComponent(components_to_group)
+        group = self.get_component_class('group')(components_to_group)
         
         # Remove individual components from main list
         for component in components_to_group:
-            if component in self.components:
+            if self._contains(component):
+                self.trail.push(RemoveChange(component, self.components.index(component)))
                 self.components.remove(component)
+                self._index_remove(component)
         
         # Add group to components
+        self.trail.push(AddChange(group, len(self.components)))
         self.components.append(group)
+        self._index_add(group)
         
-        # Clear selection and select the new group
+        # Clear selection and select the new group; the children are already
+        # drawn, so only the group outline needs painting
         self.clear_multi_selection()
         self.select_component(group)
         
-        # Redraw canvas
-        if self.canvas:
-            self.canvas.redraw_all_components()
-        
         return group
     
     def ungroup_component(self, group):
@@ -379,26 +797,32 @@ class CanvasManager:
         if not hasattr(group, 'is_group') or not group.is_group:
             return []
         
-        self._save_state()
+        self.trail.new_node()
         
         # Get children before ungrouping
         children = group.ungroup()
         
-        # Remove group from components
-        if group in self.components:
+        # Remove group from components; the children keep their own items
+        if self.canvas:
+            group.delete_from_canvas(self.canvas.canvas)
+        if self._contains(group):
+            self.trail.push(RemoveChange(group, self.components.index(group)))
             self.components.remove(group)
+            self._index_remove(group)
+        
+        # Recorded after the removal, so undo restores the children before
+        # the group is re-attached and drawn
+        self.trail.push(UngroupChange(group, children))
         
         # Add children back to components
         for child in children:
+            self.trail.push(AddChange(child, len(self.components)))
             self.components.append(child)
+            self._index_add(child)
         
         # Clear selection
         self.clear_selection()
         
-        # Redraw canvas
-        if self.canvas:
-            self.canvas.redraw_all_components()
-        
         return children
     
     def is_component_grouped(self, component):
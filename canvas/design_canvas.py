@@ -30,6 +30,13 @@ class DesignCanvas(ctk.CTkFrame):
         self.is_resizing = False
         self.resize_handle = None
         
+        # Position and size at press, recorded for undo on release
+        self.gesture_start = None
+        
+        # Drag redraws are coalesced into one per idle cycle
+        self._pending_redraw = None
+        self._redraw_component = None
+        
         # Grid settings
         self.grid_size = 20
         self.show_grid = True
@@ -107,14 +114,15 @@ class DesignCanvas(ctk.CTkFrame):
             
             if component_id:
                 # Find the component with this ID
-                for component in self.main_window.canvas_manager.components:
-                    if hasattr(component, 'id') and component.id == component_id:
-                        self.drag_component = component
-                        self.is_resizing = True
-                        self.resize_handle = clicked_item
-                        self.drag_start_x = canvas_x
-                        self.drag_start_y = canvas_y
-                        return
+                component = self.main_window.canvas_manager.get_component_by_id(component_id)
+                if component is not None:
+                    self.drag_component = component
+                    self.is_resizing = True
+                    self.resize_handle = clicked_item
+                    self.drag_start_x = canvas_x
+                    self.drag_start_y = canvas_y
+                    self._begin_gesture(component)
+                    return
         
         # Find component at click position
         component = self.main_window.canvas_manager.get_component_at_position(canvas_x, canvas_y)
@@ -137,6 +145,7 @@ class DesignCanvas(ctk.CTkFrame):
                 self.drag_component = component
                 self.drag_start_x = canvas_x
                 self.drag_start_y = canvas_y
+                self._begin_gesture(component)
         else:
             # Clear all selections
             self.main_window.canvas_manager.clear_selection()
@@ -157,13 +166,24 @@ class DesignCanvas(ctk.CTkFrame):
     def on_release(self, event):
         """Handle mouse release events"""
         if self.is_dragging or self.is_resizing:
-            # Mark as modified
-            self.main_window.mark_modified()
+            # Draw the final position before the drag state is reset
+            self._flush_drag_redraw()
+            
+            # The whole gesture is one undoable action
+            if self.drag_component and self.gesture_start:
+                if self.main_window.canvas_manager.record_geometry(
+                        self.drag_component, *self.gesture_start):
+                    self.main_window.mark_modified()
         
         self.is_dragging = False
         self.is_resizing = False
         self.drag_component = None
         self.resize_handle = None
+        self.gesture_start = None
+    
+    def _begin_gesture(self, component):
+        """Remember a component's geometry at the start of a drag or resize"""
+        self.gesture_start = ((component.x, component.y), (component.width, component.height))
     
     def on_double_click(self, event):
         """Handle double-click events"""
@@ -222,11 +242,7 @@ class DesignCanvas(ctk.CTkFrame):
         
         # Apply changes
         component.resize(new_width, new_height)
-        component.draw(self.canvas)
-        
-        # Update properties panel
-        if hasattr(self.main_window, 'properties_panel'):
-            self.main_window.properties_panel.update_selection(component)
+        self._schedule_drag_redraw(component)
         
         # Update drag start position for smooth resizing
         self.drag_start_x = canvas_x
@@ -245,14 +261,32 @@ class DesignCanvas(ctk.CTkFrame):
             new_y = round(new_y / self.grid_size) * self.grid_size
         
         self.drag_component.set_position(new_x, new_y)
-        self.drag_component.draw(self.canvas)
-        
-        # Update properties panel
-        self.main_window.properties_panel.update_selection(self.drag_component)
+        self._schedule_drag_redraw(self.drag_component)
         
         self.drag_start_x = canvas_x
         self.drag_start_y = canvas_y
     
+    def _schedule_drag_redraw(self, component):
+        """Redraw a dragged component once the pending motion events are handled"""
+        self._redraw_component = component
+        if self._pending_redraw is None:
+            self._pending_redraw = self.after_idle(self._flush_drag_redraw)
+    
+    def _flush_drag_redraw(self):
+        """Draw the latest drag state and queue a properties panel refresh"""
+        if self._pending_redraw is not None:
+            self.after_cancel(self._pending_redraw)
+            self._pending_redraw = None
+        
+        component = self._redraw_component
+        self._redraw_component = None
+        if component is None:
+            return
+        
+        component.redraw(self.canvas)
+        if hasattr(self.main_window, 'properties_panel'):
+            self.main_window.properties_panel.mark_dirty(component)
+    
     def _move_selected_component(self, direction):
         """Move selected component with arrow keys"""
         component = self.main_window.canvas_manager.selected_component
@@ -260,6 +294,8 @@ class DesignCanvas(ctk.CTkFrame):
             return
         
         step = self.grid_size if self.snap_to_grid else 5
+        old_position = (component.x, component.y)
+        old_size = (component.width, component.height)
         
         if direction == "Up":
             component.move(0, -step)
@@ -270,8 +306,9 @@ class DesignCanvas(ctk.CTkFrame):
         elif direction == "Right":
             component.move(step, 0)
         
-        component.draw(self.canvas)
-        self.main_window.properties_panel.update_selection(component)
+        component.redraw(self.canvas)
+        self.main_window.canvas_manager.record_geometry(component, old_position, old_size)
+        self.main_window.properties_panel.mark_dirty(component)
         self.main_window.mark_modified()
     
     def _edit_component_text(self, component):
@@ -285,8 +322,7 @@ class DesignCanvas(ctk.CTkFrame):
         )
         
         if new_text is not None:
-            component.text = new_text
-            component.draw(self.canvas)
+            self.main_window.canvas_manager.set_component_properties(component, text=new_text)
             self.main_window.properties_panel.update_selection(component)
             self.main_window.mark_modified()
     
@@ -315,8 +351,7 @@ class DesignCanvas(ctk.CTkFrame):
     
     def _bring_to_front(self, component):
         """Bring component to front"""
-        # Redraw component last (on top)
-        component.draw(self.canvas)
+        component.raise_to_top(self.canvas)
     
     def _send_to_back(self, component):
         """Send component to back"""
@@ -333,19 +368,22 @@ class DesignCanvas(ctk.CTkFrame):
         
         grid_color = "#e2e8f0"
         
-        # Draw vertical lines
-        for x in range(0, self.canvas_width + 1, self.grid_size):
-            self.canvas.create_line(
-                x, 0, x, self.canvas_height,
-                fill=grid_color, tags="grid"
-            )
+        # Each direction is one polyline that snakes along the grid lines,
+        # turning along the canvas edge, so the grid is two canvas items
+        # instead of one per line
+        vertical = []
+        edges = (0, self.canvas_height)
+        for i, x in enumerate(range(0, self.canvas_width + 1, self.grid_size)):
+            vertical += (x, edges[i % 2], x, edges[1 - i % 2])
+        
+        horizontal = []
+        edges = (0, self.canvas_width)
+        for i, y in enumerate(range(0, self.canvas_height + 1, self.grid_size)):
+            horizontal += (edges[i % 2], y, edges[1 - i % 2], y)
         
-        # Draw horizontal lines
-        for y in range(0, self.canvas_height + 1, self.grid_size):
-            self.canvas.create_line(
-                0, y, self.canvas_width, y,
-                fill=grid_color, tags="grid"
-            )
+        for coords in (vertical, horizontal):
+            if len(coords) >= 4:
+                self.canvas.create_line(*coords, fill=grid_color, tags="grid")
         
         # Move grid to back
         self.canvas.tag_lower("grid")
@@ -403,4 +441,5 @@ class DesignCanvas(ctk.CTkFrame):
         """Redraw all components on the canvas"""
         self.clear()
         for component in self.main_window.canvas_manager.components:
+            component.forget_canvas_items()
             component.draw(self.canvas)
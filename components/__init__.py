@@ -3,10 +3,6 @@ Components module initialization
 """
 
 from .base_component import BaseComponent
-from .rectangle import RectangleComponent
-from .button import ButtonComponent
-from .input_field import InputFieldComponent
-from .text_label import TextLabelComponent
 
 __all__ = [
     'BaseComponent',
@@ -15,3 +11,18 @@ __all__ = [
     'InputFieldComponent',
     'TextLabelComponent'
 ]
+
+# Concrete components are imported on first access
+_LAZY_EXPORTS = {
+    'RectangleComponent': '.rectangle',
+    'ButtonComponent': '.button',
+    'InputFieldComponent': '.input_field',
+    'TextLabelComponent': '.text_label'
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        from importlib import import_module
+        return getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
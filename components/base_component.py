@@ -2,21 +2,143 @@
 Base component class for all UI elements
 """
 
+import copy
+import itertools
+import math
+import tkinter
 import uuid
 from abc import ABC, abstractmethod
+from operator import attrgetter
+
+# Ids are a random per-process prefix plus a counter, so saved designs from
+# other sessions don't collide without paying for uuid4() on every component
+_ID_PREFIX = uuid.uuid4().hex[:12]
+_id_counter = itertools.count()
+
+
+def _new_id():
+    """Return a new unique component id"""
+    return f"{_ID_PREFIX}-{next(_id_counter):08x}"
+
+
+def _compile_from_dict(fields):
+    """Generate a from_dict() with one inline assignment per field"""
+    lines = [
+        "def from_dict(self, data):",
+        "    self.id = data.get('id', self.id)"
+    ]
+    for field in fields:
+        if not field.isidentifier():
+            raise ValueError(f"Invalid field name: {field!r}")
+        lines.append(f"    if {field!r} in data:")
+        lines.append(f"        self.{field} = data[{field!r}]")
+    lines.append("    self.invalidate()")
+    namespace = {}
+    exec("\n".join(lines), namespace)
+    from_dict = namespace['from_dict']
+    from_dict._generated = True
+    return from_dict
+
+# (cos, sin) samples over a quarter turn, shared by every rounded corner
+_ARC_STEPS = 6
+_ARC_SAMPLES = tuple(
+    (math.cos(i * math.pi / (2 * _ARC_STEPS)), math.sin(i * math.pi / (2 * _ARC_STEPS)))
+    for i in range(_ARC_STEPS + 1)
+)
+
+# Selection handles sit centred on the corners, given as fractions of the size
+HANDLE_SIZE = 6
+_HANDLE_CORNERS = ((0, 0), (1, 0), (0, 1), (1, 1))
+
+# Canvas tags and selection styling shared by every component
+COMPONENT_TAG = "component"
+HANDLE_TAG = "selection_handle"
+BORDER_TAG = "selection_border"
+SELECTION_COLOR = "#2563eb"
+SELECTION_DASH = (5, 5)
+_SELECTION_QUERY = f"&&({HANDLE_TAG}||{BORDER_TAG})"  # Appended to a component id
+
+# Handle images, one per Tk interpreter since images belong to the interpreter
+_HANDLE_SPRITES = {}
+
+
+def _get_handle_sprite(canvas):
+    """Return the name of the selection handle image for the canvas"""
+    sprite = _HANDLE_SPRITES.get(canvas.tk)
+    if sprite is None:
+        # A white square inside a 2px ring, as the outlined rectangles used to draw
+        size = HANDLE_SIZE + 2
+        sprite = tkinter.PhotoImage(master=canvas, width=size, height=size)
+        sprite.put(SELECTION_COLOR, to=(0, 0, size, size))
+        sprite.put("white", to=(2, 2, size - 2, size - 2))
+        _HANDLE_SPRITES[canvas.tk] = sprite
+    return sprite.name
+
+
+def _rounded_rect_points(x1, y1, x2, y2, r):
+    """Return a flat vertex list outlining a rectangle with rounded corners"""
+    points = []
+    extend = points.extend
+    # Corners run clockwise from the top-left, each from its start edge to its end edge
+    cx, cy = x1 + r, y1 + r
+    for c, s in _ARC_SAMPLES:
+        extend((cx - r * c, cy - r * s))
+    cx = x2 - r
+    for c, s in _ARC_SAMPLES:
+        extend((cx + r * s, cy - r * c))
+    cy = y2 - r
+    for c, s in _ARC_SAMPLES:
+        extend((cx + r * c, cy + r * s))
+    cx = x1 + r
+    for c, s in _ARC_SAMPLES:
+        extend((cx - r * s, cy + r * c))
+    return points
+
 
 class BaseComponent(ABC):
     """Base class for all UI components"""
     
+    # Fixed attribute layout keeps instances small and attribute access fast;
+    # subclasses list only the attributes they add
+    __slots__ = (
+        'id', 'x', 'y', 'width', 'height', 'selected', 'canvas_items', 'parent_group',
+        'fill_color', 'border_color', 'border_width', 'text_color', 'font_family',
+        'font_size', 'font_weight', 'text', 'corner_radius', 'opacity',
+        '_dict_cache', '_spatial_index', '_drawn_at', '_draw_signature', '_last_style',
+        '_reuse_items', '_font_cache', '_radius_cache'
+    )
+    
+    # Attributes saved by to_dict() and restored by from_dict(), besides id and type;
+    # subclasses extend the tuple with their own properties
+    _FIELDS = (
+        'x', 'y', 'width', 'height', 'text', 'fill_color', 'border_color',
+        'border_width', 'text_color', 'font_family', 'font_size', 'font_weight',
+        'corner_radius', 'opacity'
+    )
+    _get_fields = attrgetter(*_FIELDS)
+    
+    # Style of the dashed border drawn around a selected component
+    _SELECTION_BORDER_WIDTH = 2
+    _SELECTION_BORDER_DASH = SELECTION_DASH
+    
     def __init__(self, x=0, y=0, width=100, height=50):
         """Initialize base component"""
-        self.id = str(uuid.uuid4())
+        self._spatial_index = None  # Canvas spatial index holding the component
+        self._dict_cache = None  # Last to_dict() result, see get_cached_dict()
+        self._drawn_at = None  # (canvas, x, y) the items were last drawn at
+        self.id = _new_id()
         self.x = x
         self.y = y
         self.width = width
         self.height = height
         self.selected = False
         self.canvas_items = []  # Store tkinter canvas item IDs
+        self.parent_group = None
+        self._draw_signature = None  # (canvas, selected, layout) of the drawn items
+        self._last_style = {}  # Options each canvas item was last drawn with
+        self._reuse_items = None  # Items being updated in place by the current draw
+        self._font_cache = None  # Tk font string, rebuilt when a font attribute changes
+        self._radius_cache = None  # Corner radius clamped to the size
         
         # Visual properties
         self.fill_color = "#3b82f6"
@@ -32,6 +154,23 @@ class BaseComponent(ABC):
         self.corner_radius = 0
         self.opacity = 1.0
         
+    def __init_subclass__(cls, **kwargs):
+        """Build the field getter and from_dict() for the subclass's _FIELDS"""
+        super().__init_subclass__(**kwargs)
+        cls._get_fields = attrgetter(*cls._FIELDS)
+        cls._all_slots = tuple(
+            name for klass in reversed(cls.__mro__)
+            for name in klass.__dict__.get('__slots__', ())
+        )
+        
+        # Replace the generic from_dict() loop with one specialised to the
+        # fields, unless a class in between wrote its own
+        if cls.from_dict is BaseComponent.from_dict or getattr(cls.from_dict, '_generated', False):
+            from_dict = _compile_from_dict(cls._FIELDS)
+            from_dict.__doc__ = BaseComponent.from_dict.__doc__
+            from_dict.__qualname__ = f"{cls.__qualname__}.from_dict"
+            cls.from_dict = from_dict
+    
     @abstractmethod
     def get_component_type(self):
         """Return the component type string"""
@@ -47,6 +186,106 @@ class BaseComponent(ABC):
         """Draw the component on the canvas"""
         pass
     
+    def invalidate(self):
+        """Drop everything derived from the attributes, after setting them directly"""
+        self._dict_cache = None
+        self._drawn_at = None
+        self._font_cache = None
+        self._radius_cache = None
+        self._bounds_changed()
+    
+    def _bounds_changed(self):
+        """Let the owning spatial index know the component's box is stale"""
+        index = self._spatial_index
+        if index is not None:
+            index.mark_moved(self)
+    
+    def set_properties(self, **values):
+        """Set attributes by name and drop the caches derived from them"""
+        for name, value in values.items():
+            setattr(self, name, value)
+        self.invalidate()
+    
+    def _build_font(self):
+        """Build the Tk font string for the component's text"""
+        font = f"{self.font_family} {self.font_size}"
+        if self.font_weight == "bold":
+            font += " bold"
+        return font
+    
+    def _get_font(self):
+        """Return the Tk font string, rebuilding it only after a font change"""
+        font = self._font_cache
+        if font is None:
+            font = self._build_font()
+            self._font_cache = font
+        return font
+    
+    def get_effective_radius(self):
+        """Return the corner radius, clamped so the corners fit the size"""
+        r = self._radius_cache
+        if r is None:
+            r = min(self.corner_radius, self.width // 2, self.height // 2)
+            self._radius_cache = r
+        return r
+    
+    def _get_item_layout(self):
+        """Return the state that decides which canvas items draw() creates"""
+        return (self.corner_radius > 0, bool(self.text))
+    
+    def _begin_draw(self, canvas):
+        """Start a draw, keeping the existing items if they have the same layout
+        
+        Returns False if nothing changed since the items were drawn on this
+        canvas, so the draw can stop without touching them.
+        """
+        if self.canvas_items and self._drawn_at == (canvas, self.x, self.y):
+            return False
+        
+        signature = (canvas, self.selected, self._get_item_layout())
+        if self.canvas_items and signature == self._draw_signature:
+            self._reuse_items = iter(self.canvas_items)
+        else:
+            self.delete_from_canvas(canvas)
+        self._draw_signature = signature
+        self._drawn_at = (canvas, self.x, self.y)
+        return True
+    
+    def _draw_item(self, canvas, kind, coords, **options):
+        """Create a canvas item, or update the matching item from the last draw"""
+        # Talk to the Tk canvas command directly; the tkinter wrappers flatten
+        # and re-parse their arguments on every call
+        call = canvas.tk.call
+        if self._reuse_items is not None:
+            item_id = next(self._reuse_items)
+            call(canvas._w, 'coords', item_id, *coords)
+            last = self._last_style.get(item_id, {})
+            changed = [
+                arg for key, value in options.items() if last.get(key) != value
+                for arg in ('-' + key, value)
+            ]
+            if changed:
+                call(canvas._w, 'itemconfigure', item_id, *changed)
+        else:
+            args = [arg for key, value in options.items() for arg in ('-' + key, value)]
+            item_id = canvas.tk.getint(call(canvas._w, 'create', kind, *coords, *args))
+            self.canvas_items.append(item_id)
+        self._last_style[item_id] = options
+        return item_id
+    
+    def redraw(self, canvas):
+        """Draw the component, moving its existing items if only the position changed"""
+        drawn_at = getattr(self, '_drawn_at', None)
+        if drawn_at is not None and drawn_at[0] is canvas and self.canvas_items:
+            # Every item is tagged with the component id, so one move shifts them all
+            dx = self.x - drawn_at[1]
+            dy = self.y - drawn_at[2]
+            if dx or dy:
+                canvas.move(self.id, dx, dy)
+        else:
+            self.draw(canvas)
+        self._drawn_at = (canvas, self.x, self.y)
+    
     def is_point_inside(self, x, y):
         """Check if a point is inside the component"""
         return (self.x <= x <= self.x + self.width and 
@@ -56,16 +295,22 @@ class BaseComponent(ABC):
         """Move the component by the given offset"""
         self.x += dx
         self.y += dy
+        # The drawn items stay valid; redraw() shifts them by the offset
+        self._dict_cache = None
+        self._bounds_changed()
     
     def resize(self, width, height):
         """Resize the component"""
         self.width = max(10, width)  # Minimum width
         self.height = max(10, height)  # Minimum height
+        self.invalidate()
     
     def set_position(self, x, y):
         """Set the component position"""
         self.x = x
         self.y = y
+        self._dict_cache = None
+        self._bounds_changed()
     
     def get_bounds(self):
         """Get component bounds as (x, y, width, height)"""
@@ -78,65 +323,168 @@ class BaseComponent(ABC):
     def select(self):
         """Select the component"""
         self.selected = True
+        self._drawn_at = None  # The next draw adds the handles
     
     def deselect(self):
         """Deselect the component"""
         self.selected = False
+        self._drawn_at = None
+    
+    def show_selection_handles(self, canvas):
+        """Select the component, drawing handles over its existing shape"""
+        drawn_at = getattr(self, '_drawn_at', None)
+        self.select()
+        if not self.canvas_items:
+            self.draw(canvas)
+            return
+        
+        self._delete_selection_items(canvas)
+        self._reuse_items = None
+        self._draw_selection_handles(canvas)
+        self._set_drawn_selected()
+        self._drawn_at = drawn_at  # Handles carry the id tag, so they move too
+    
+    def hide_selection_handles(self, canvas):
+        """Deselect the component, removing only its handles"""
+        drawn_at = getattr(self, '_drawn_at', None)
+        self.deselect()
+        if self.canvas_items:
+            self._delete_selection_items(canvas)
+            self._set_drawn_selected()
+        self._drawn_at = drawn_at
+    
+    def _draw_rounded_box(self, canvas):
+        """Draw the component's filled box, as one polygon if its corners are rounded"""
+        x1, y1 = self.x, self.y
+        x2, y2 = x1 + self.width, y1 + self.height
+        if self.corner_radius > 0:
+            coords = _rounded_rect_points(x1, y1, x2, y2, self.get_effective_radius())
+            kind = 'polygon'
+        else:
+            coords = (x1, y1, x2, y2)
+            kind = 'rectangle'
+        self._draw_item(
+            canvas, kind, coords,
+            fill=self.fill_color,
+            outline=self.border_color,
+            width=self.border_width,
+            tags=(COMPONENT_TAG, self.id)
+        )
+    
+    def _draw_selection_handles(self, canvas):
+        """Draw selection handles and a dashed border around the component"""
+        x1, y1 = self.x, self.y
+        width, height = self.width, self.height
+        
+        # Corner handles share one prebuilt image, so Tk only blits it
+        sprite = _get_handle_sprite(canvas)
+        tags = (HANDLE_TAG, self.id)
+        for fx, fy in _HANDLE_CORNERS:
+            self._draw_item(
+                canvas, 'image', (x1 + fx * width, y1 + fy * height),
+                image=sprite,
+                tags=tags
+            )
+        
+        # Selection border
+        self._draw_item(
+            canvas, 'rectangle', (x1 - 1, y1 - 1, x1 + width + 1, y1 + height + 1),
+            fill="",
+            outline=SELECTION_COLOR,
+            width=self._SELECTION_BORDER_WIDTH,
+            dash=self._SELECTION_BORDER_DASH,
+            tags=(BORDER_TAG, self.id)
+        )
+    
+    def _set_drawn_selected(self):
+        """Record that the drawn items now match the current selection state"""
+        if self._draw_signature is not None:
+            canvas, _, layout = self._draw_signature
+            self._draw_signature = (canvas, self.selected, layout)
+    
+    def _delete_selection_items(self, canvas):
+        """Delete the selection handles and border drawn for this component"""
+        items = canvas.find_withtag(self.id + _SELECTION_QUERY)
+        if items:
+            canvas.delete(*items)
+            stale = set(items)
+            self.canvas_items[:] = [item for item in self.canvas_items if item not in stale]
+            for item in items:
+                self._last_style.pop(item, None)
     
     def delete_from_canvas(self, canvas):
         """Remove component from canvas"""
-        for item_id in self.canvas_items:
-            canvas.delete(item_id)
+        # Every item is tagged with the component id, so one call removes them all
+        if self.canvas_items:
+            canvas.delete(self.id)
+        self._clear_items()
+    
+    def forget_canvas_items(self):
+        """Drop the stored canvas items, e.g. after the canvas was cleared"""
+        self._clear_items()
+    
+    def _clear_items(self):
+        """Reset the record of this component's own canvas items"""
         self.canvas_items.clear()
+        self._last_style.clear()
+        self._draw_signature = None
+        self._reuse_items = None
+        self._drawn_at = None
+    
+    def raise_to_top(self, canvas):
+        """Raise the component's canvas items above all others"""
+        if self.canvas_items:
+            canvas.tag_raise(self.id)
     
     def to_dict(self):
         """Convert component to dictionary for serialization"""
-        return {
-            'id': self.id,
-            'type': self.get_component_type(),
-            'x': self.x,
-            'y': self.y,
-            'width': self.width,
-            'height': self.height,
-            'text': self.text,
-            'fill_color': self.fill_color,
-            'border_color': self.border_color,
-            'border_width': self.border_width,
-            'text_color': self.text_color,
-            'font_family': self.font_family,
-            'font_size': self.font_size,
-            'font_weight': self.font_weight,
-            'corner_radius': self.corner_radius,
-            'opacity': self.opacity
-        }
+        data = {'id': self.id, 'type': self.get_component_type()}
+        data.update(zip(self._FIELDS, self._get_fields(self)))
+        return data
+    
+    def get_cached_dict(self):
+        """Return to_dict(), reusing the last result until an attribute changes"""
+        # The cached dict is shared between callers and must not be mutated
+        cached = getattr(self, '_dict_cache', None)
+        if cached is None:
+            cached = self.to_dict()
+            self._dict_cache = cached
+        return cached
     
     def from_dict(self, data):
         """Load component from dictionary"""
         self.id = data.get('id', self.id)
-        self.x = data.get('x', self.x)
-        self.y = data.get('y', self.y)
-        self.width = data.get('width', self.width)
-        self.height = data.get('height', self.height)
-        self.text = data.get('text', self.text)
-        self.fill_color = data.get('fill_color', self.fill_color)
-        self.border_color = data.get('border_color', self.border_color)
-        self.border_width = data.get('border_width', self.border_width)
-        self.text_color = data.get('text_color', self.text_color)
-        self.font_family = data.get('font_family', self.font_family)
-        self.font_size = data.get('font_size', self.font_size)
-        self.font_weight = data.get('font_weight', self.font_weight)
-        self.corner_radius = data.get('corner_radius', self.corner_radius)
-        self.opacity = data.get('opacity', self.opacity)
+        for field in self._FIELDS:
+            if field in data:
+                setattr(self, field, data[field])
+        self.invalidate()
+    
+    def __copy__(self):
+        """Return a shallow copy, filling the new instance's slots directly"""
+        cls = self.__class__
+        clone = cls.__new__(cls)
+        for name in cls._all_slots:
+            setattr(clone, name, getattr(self, name))
+        return clone
     
     def clone(self):
         """Create a copy of the component"""
-        clone_data = self.to_dict()
-        clone_data['id'] = str(uuid.uuid4())  # New ID for clone
-        clone_data['x'] += 20  # Offset position
-        clone_data['y'] += 20
-        
-        # Create new instance of the same type
-        component_class = self.__class__
-        clone = component_class()
-        clone.from_dict(clone_data)
+        # Copy the attributes directly rather than round-tripping through a dict
+        clone = copy.copy(self)
+        clone._reset_copy()
+        clone.x += 20  # Offset position
+        clone.y += 20
         return clone
+    
+    def _reset_copy(self):
+        """Give a shallow copy its own id and an undrawn, unselected state"""
+        self.id = _new_id()
+        self.selected = False
+        self.parent_group = None
+        self.canvas_items = []
+        self._last_style = {}
+        self._spatial_index = None
+        self._dict_cache = None
+        self._drawn_at = None
+        self._draw_signature = None
+        self._reuse_items = None
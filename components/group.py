@@ -2,15 +2,23 @@
 Group component for organizing multiple components together
 """
 
-from .base_component import BaseComponent
-import uuid
+from .base_component import BaseComponent, _new_id, _HANDLE_CORNERS, HANDLE_TAG, SELECTION_DASH
+
+GROUP_HANDLE_SIZE = 8
+GROUP_SELECTION_COLOR = "#10b981"
 
 class GroupComponent(BaseComponent):
     """Group component that contains multiple child components"""
     
+    __slots__ = ('children', 'group_id', 'is_group', '_child_set')
+    
+    # Children are not restored by from_dict(); the canvas manager rebuilds them
+    _FIELDS = BaseComponent._FIELDS + ('group_id',)
+    
     def __init__(self, components=None, x=0, y=0):
         """Initialize group component"""
         self.children = components or []
+        self._child_set = set(self.children)  # O(1) membership for add/remove_child
         
         # Calculate bounds from children
         if self.children:
@@ -19,7 +27,7 @@ class GroupComponent(BaseComponent):
         else:
             super().__init__(x, y, 100, 100)
         
-        self.group_id = str(uuid.uuid4())
+        self.group_id = _new_id()
         self.is_group = True
     
     def get_component_type(self):
@@ -35,10 +43,22 @@ class GroupComponent(BaseComponent):
         if not self.children:
             return 0, 0, 100, 100
         
-        min_x = min(child.x for child in self.children)
-        min_y = min(child.y for child in self.children)
-        max_x = max(child.x + child.width for child in self.children)
-        max_y = max(child.y + child.height for child in self.children)
+        # One pass over the children rather than one per edge
+        first = self.children[0]
+        min_x, min_y = first.x, first.y
+        max_x, max_y = min_x + first.width, min_y + first.height
+        for child in self.children:
+            x, y = child.x, child.y
+            if x < min_x:
+                min_x = x
+            if y < min_y:
+                min_y = y
+            right = x + child.width
+            if right > max_x:
+                max_x = right
+            bottom = y + child.height
+            if bottom > max_y:
+                max_y = bottom
         
         return min_x, min_y, max_x - min_x, max_y - min_y
     
@@ -47,38 +67,53 @@ class GroupComponent(BaseComponent):
         if self.children:
             bounds = self._calculate_bounds()
             self.x, self.y, self.width, self.height = bounds
+            self.invalidate()
+    
+    def _extend_bounds(self, component):
+        """Grow the group bounds to take in a newly added child"""
+        if len(self.children) == 1:
+            self.update_bounds()
+            return
+        
+        min_x = min(self.x, component.x)
+        min_y = min(self.y, component.y)
+        max_x = max(self.x + self.width, component.x + component.width)
+        max_y = max(self.y + self.height, component.y + component.height)
+        self.x, self.y, self.width, self.height = min_x, min_y, max_x - min_x, max_y - min_y
+        self.invalidate()
     
     def add_child(self, component):
         """Add a component to the group"""
-        if component not in self.children:
+        if component not in self._child_set:
+            self._child_set.add(component)
             self.children.append(component)
             component.parent_group = self
-            self.update_bounds()
+            self._extend_bounds(component)
     
     def remove_child(self, component):
         """Remove a component from the group"""
-        if component in self.children:
+        if component in self._child_set:
+            self._child_set.discard(component)
             self.children.remove(component)
             if hasattr(component, 'parent_group'):
                 component.parent_group = None
-            self.update_bounds()
+            # Only a child on the edge of the bounds can shrink them
+            if (component.x <= self.x or component.y <= self.y or
+                    component.x + component.width >= self.x + self.width or
+                    component.y + component.height >= self.y + self.height):
+                self.update_bounds()
     
     def draw(self, canvas):
         """Draw the group (just a selection outline when selected)"""
-        # Clear previous canvas items
-        for item_id in self.canvas_items:
-            try:
-                canvas.delete(item_id)
-            except:
-                pass
-        self.canvas_items.clear()
+        # The group's own items are only its selection outline
+        outline_changed = self._begin_draw(canvas)
         
-        # Draw children first
+        # Draw children first; each one skips itself if it is unchanged
         for child in self.children:
             child.draw(canvas)
         
         # Draw group selection if selected
-        if self.selected:
+        if self.selected and outline_changed:
             self._draw_selection_outline(canvas)
     
     def _draw_selection_outline(self, canvas):
@@ -87,34 +122,32 @@ class GroupComponent(BaseComponent):
         x2, y2 = self.x + self.width, self.y + self.height
         
         # Group selection border (dashed line)
-        border_id = canvas.create_rectangle(
-            x1 - 2, y1 - 2, x2 + 2, y2 + 2,
+        self._draw_item(
+            canvas, 'rectangle', (x1 - 2, y1 - 2, x2 + 2, y2 + 2),
             fill="",
-            outline="#10b981",
+            outline=GROUP_SELECTION_COLOR,
             width=2,
-            dash=(5, 5),
+            dash=SELECTION_DASH,
             tags=("group_selection", self.id)
         )
-        self.canvas_items.append(border_id)
         
         # Group handles (larger than individual component handles)
-        handle_size = 8
-        handles = [
-            (x1 - handle_size//2, y1 - handle_size//2),  # Top-left
-            (x2 - handle_size//2, y1 - handle_size//2),  # Top-right
-            (x1 - handle_size//2, y2 - handle_size//2),  # Bottom-left
-            (x2 - handle_size//2, y2 - handle_size//2),  # Bottom-right
-        ]
-        
-        for hx, hy in handles:
-            handle_id = canvas.create_rectangle(
-                hx, hy, hx + handle_size, hy + handle_size,
-                fill="#10b981",
+        offset = GROUP_HANDLE_SIZE // 2
+        tags = (HANDLE_TAG, self.id)
+        for fx, fy in _HANDLE_CORNERS:
+            hx = x1 + fx * self.width - offset
+            hy = y1 + fy * self.height - offset
+            self._draw_item(
+                canvas, 'rectangle', (hx, hy, hx + GROUP_HANDLE_SIZE, hy + GROUP_HANDLE_SIZE),
+                fill=GROUP_SELECTION_COLOR,
                 outline="white",
                 width=2,
-                tags=("selection_handle", self.id)
+                tags=tags
             )
-            self.canvas_items.append(handle_id)
+    
+    def _get_item_layout(self):
+        """Return the state that decides which canvas items draw() creates"""
+        return ()
     
     def move(self, dx, dy):
         """Move the group and all its children"""
@@ -125,6 +158,10 @@ class GroupComponent(BaseComponent):
         # Update group position
         super().move(dx, dy)
     
+    def set_position(self, x, y):
+        """Move the group and all its children to the given position"""
+        self.move(x - self.x, y - self.y)
+    
     def resize(self, width, height):
         """Resize the group (scales all children proportionally)"""
         if not self.children or self.width == 0 or self.height == 0:
@@ -137,29 +174,63 @@ class GroupComponent(BaseComponent):
         # Store original group position
         group_x, group_y = self.x, self.y
         
-        # Scale and reposition children
+        # Scale and reposition children relative to the group origin
+        clamped = False
         for child in self.children:
-            # Calculate relative position within group
-            rel_x = (child.x - group_x) / self.width
-            rel_y = (child.y - group_y) / self.height
-            rel_w = child.width / self.width
-            rel_h = child.height / self.height
-            
-            # Apply scaling
-            new_x = group_x + rel_x * width
-            new_y = group_y + rel_y * height
-            new_w = rel_w * width
-            new_h = rel_h * height
+            new_x = group_x + (child.x - group_x) * scale_x
+            new_y = group_y + (child.y - group_y) * scale_y
+            new_w = child.width * scale_x
+            new_h = child.height * scale_y
+            if new_w < 10 or new_h < 10:
+                clamped = True
             
             child.set_position(new_x, new_y)
             child.resize(max(10, new_w), max(10, new_h))
         
-        # Update group size
-        self.width = width
-        self.height = height
+        # Update group size; children held at their minimum size can stick out
+        # of the requested box, and the bounds must still enclose them
+        if clamped:
+            self.update_bounds()
+        else:
+            self.width = width
+            self.height = height
+            self.invalidate()
+    
+    def show_selection_handles(self, canvas):
+        """Select the group, drawing only its outline over the children"""
+        self.select()
+        self.delete_from_canvas(canvas)
+        self._draw_selection_outline(canvas)
+        self._draw_signature = (canvas, self.selected, self._get_item_layout())
+    
+    def hide_selection_handles(self, canvas):
+        """Deselect the group; its own items are all selection outline"""
+        self.deselect()
+        self.delete_from_canvas(canvas)
+        self._draw_signature = (canvas, self.selected, self._get_item_layout())
+    
+    def redraw(self, canvas):
+        """Always draw in full, since children carry their own canvas items"""
+        self.draw(canvas)
+    
+    def forget_canvas_items(self):
+        """Drop the stored canvas items of the group and its children"""
+        super().forget_canvas_items()
+        for child in self.children:
+            child.forget_canvas_items()
+    
+    def raise_to_top(self, canvas):
+        """Raise the children's items, then the group outline, above all others"""
+        for child in self.children:
+            child.raise_to_top(canvas)
+        super().raise_to_top(canvas)
     
     def is_point_inside(self, x, y):
         """Check if point is inside any child component"""
+        # The group bounds enclose every child, so a miss rejects them all
+        if not (self.x <= x <= self.x + self.width and
+                self.y <= y <= self.y + self.height):
+            return False
         for child in self.children:
             if child.is_point_inside(x, y):
                 return True
@@ -172,25 +243,44 @@ class GroupComponent(BaseComponent):
             if hasattr(child, 'parent_group'):
                 child.parent_group = None
         self.children.clear()
+        self._child_set.clear()
         return children
     
+    def set_children(self, children):
+        """Replace the children, e.g. to restore those released by ungroup()"""
+        self.children = list(children)
+        self._child_set = set(self.children)
+        for child in self.children:
+            child.parent_group = self
+    
     def to_dict(self):
         """Convert group to dictionary for serialization"""
         data = super().to_dict()
-        data.update({
-            'group_id': self.group_id,
-            'children': [child.to_dict() for child in self.children]
-        })
+        data['children'] = [child.to_dict() for child in self.children]
         return data
     
-    def from_dict(self, data):
-        """Load group from dictionary"""
-        super().from_dict(data)
-        self.group_id = data.get('group_id', str(uuid.uuid4()))
-        # Note: Children will be reconstructed by the canvas manager
+    def get_cached_dict(self):
+        """Always rebuild, since children change without touching the group"""
+        return self.to_dict()
     
     def clone(self):
         """Create a copy of the group with cloned children"""
-        cloned_children = [child.clone() for child in self.children]
-        cloned_group = GroupComponent(cloned_children, self.x + 20, self.y + 20)
+        cloned_group = BaseComponent.clone(self)
+        cloned_group.group_id = _new_id()
+        
+        # Walk nested groups with a stack; each copy shares its original's
+        # children until they are replaced with clones here
+        stack = [(self, cloned_group)]
+        while stack:
+            original, group = stack.pop()
+            cloned_children = []
+            for child in original.children:
+                if getattr(child, 'is_group', False):
+                    cloned_child = BaseComponent.clone(child)
+                    cloned_child.group_id = _new_id()
+                    stack.append((child, cloned_child))
+                else:
+                    cloned_child = child.clone()
+                cloned_children.append(cloned_child)
+            group.set_children(cloned_children)
         return cloned_group
\ No newline at end of file
@@ -2,11 +2,32 @@
 Input field component implementation
 """
 
-from .base_component import BaseComponent
+from .base_component import BaseComponent, COMPONENT_TAG
+
+# Pixel widths of measured strings, keyed by (font, text)
+_TEXT_WIDTH_CACHE = {}
+_TEXT_WIDTH_CACHE_SIZE = 1024
+
+
+def _measure(canvas, font, text):
+    """Return the width of text in font, asking Tk once per string"""
+    key = (font, text)
+    width = _TEXT_WIDTH_CACHE.get(key)
+    if width is None:
+        if len(_TEXT_WIDTH_CACHE) >= _TEXT_WIDTH_CACHE_SIZE:
+            _TEXT_WIDTH_CACHE.clear()
+        width = canvas.tk.getint(canvas.tk.call('font', 'measure', font, text))
+        _TEXT_WIDTH_CACHE[key] = width
+    return width
+
 
 class InputFieldComponent(BaseComponent):
     """Input field UI component"""
     
+    __slots__ = ('placeholder_text', 'placeholder_color')
+    
+    _FIELDS = BaseComponent._FIELDS + ('placeholder_text', 'placeholder_color')
+    
     def __init__(self, x=0, y=0, width=200, height=36):
         """Initialize input field component"""
         super().__init__(x, y, width, height)
@@ -25,66 +46,23 @@ class InputFieldComponent(BaseComponent):
         """Return default text"""
         return ""
     
+    def _build_font(self):
+        """Build the Tk font string; input text ignores the font weight"""
+        return f"{self.font_family} {self.font_size}"
+    
+    def _get_item_layout(self):
+        """Return the state that decides which canvas items draw() creates"""
+        return (self.corner_radius > 0, bool(self.text or self.placeholder_text), bool(self.text))
+    
     def draw(self, canvas):
         """Draw the input field on canvas"""
-        # Clear previous drawings
-        self.delete_from_canvas(canvas)
-        
-        x1, y1 = self.x, self.y
-        x2, y2 = self.x + self.width, self.y + self.height
+        # Update the previous drawings in place, or clear them if the layout changed;
+        # an unchanged component keeps its items as they are
+        if not self._begin_draw(canvas):
+            return
         
-        # Draw input background
-        if self.corner_radius > 0:
-            # Draw rounded rectangle
-            r = min(self.corner_radius, self.width // 2, self.height // 2)
-            
-            # Main rectangle
-            rect_id = canvas.create_rectangle(
-                x1 + r, y1, x2 - r, y2,
-                fill=self.fill_color,
-                outline=self.border_color,
-                width=self.border_width,
-                tags=("component", self.id)
-            )
-            self.canvas_items.append(rect_id)
-            
-            # Horizontal bars
-            rect_id = canvas.create_rectangle(
-                x1, y1 + r, x2, y2 - r,
-                fill=self.fill_color,
-                outline="",
-                tags=("component", self.id)
-            )
-            self.canvas_items.append(rect_id)
-            
-            # Corner arcs
-            corners = [
-                (x1, y1, x1 + 2*r, y1 + 2*r, 90, 90),
-                (x2 - 2*r, y1, x2, y1 + 2*r, 0, 90),
-                (x1, y2 - 2*r, x1 + 2*r, y2, 180, 90),
-                (x2 - 2*r, y2 - 2*r, x2, y2, 270, 90)
-            ]
-            
-            for corner in corners:
-                arc_id = canvas.create_arc(
-                    corner[0], corner[1], corner[2], corner[3],
-                    start=corner[4], extent=corner[5],
-                    fill=self.fill_color,
-                    outline=self.border_color,
-                    width=self.border_width,
-                    style="pieslice",
-                    tags=("component", self.id)
-                )
-                self.canvas_items.append(arc_id)
-        else:
-            rect_id = canvas.create_rectangle(
-                x1, y1, x2, y2,
-                fill=self.fill_color,
-                outline=self.border_color,
-                width=self.border_width,
-                tags=("component", self.id)
-            )
-            self.canvas_items.append(rect_id)
+        # Input background
+        self._draw_rounded_box(canvas)
         
         # Draw text or placeholder
         text_to_show = self.text if self.text else self.placeholder_text
@@ -95,80 +73,28 @@ class InputFieldComponent(BaseComponent):
             text_x = self.x + 12  # Left padding
             text_y = self.y + self.height // 2
             
-            font_style = f"{self.font_family} {self.font_size}"
-            
-            text_id = canvas.create_text(
-                text_x, text_y,
+            self._draw_item(
+                canvas, 'text', (text_x, text_y),
                 text=text_to_show,
                 fill=text_color,
-                font=font_style,
+                font=self._get_font(),
                 anchor="w",  # West (left) alignment
-                tags=("component", self.id, "text")
+                tags=(COMPONENT_TAG, self.id, "text")
             )
-            self.canvas_items.append(text_id)
         
         # Draw cursor if has text (visual indicator)
         if self.text:
-            cursor_x = self.x + 12 + len(self.text) * 7  # Approximate cursor position
+            cursor_x = self.x + 12 + _measure(canvas, self._get_font(), self.text)
             cursor_y1 = self.y + 8
             cursor_y2 = self.y + self.height - 8
             
-            cursor_id = canvas.create_line(
-                cursor_x, cursor_y1, cursor_x, cursor_y2,
+            self._draw_item(
+                canvas, 'line', (cursor_x, cursor_y1, cursor_x, cursor_y2),
                 fill=self.text_color,
                 width=1,
-                tags=("component", self.id, "cursor")
+                tags=(COMPONENT_TAG, self.id, "cursor")
             )
-            self.canvas_items.append(cursor_id)
         
         # Draw selection handles if selected
         if self.selected:
             self._draw_selection_handles(canvas)
-    
-    def _draw_selection_handles(self, canvas):
-        """Draw selection handles around the component"""
-        handle_size = 6
-        x1, y1 = self.x, self.y
-        x2, y2 = self.x + self.width, self.y + self.height
-        
-        # Corner handles
-        handles = [
-            (x1 - handle_size//2, y1 - handle_size//2),
-            (x2 - handle_size//2, y1 - handle_size//2),
-            (x1 - handle_size//2, y2 - handle_size//2),
-            (x2 - handle_size//2, y2 - handle_size//2),
-        ]
-        
-        for hx, hy in handles:
-            handle_id = canvas.create_rectangle(
-                hx, hy, hx + handle_size, hy + handle_size,
-                fill="white",
-                outline="#2563eb",
-                width=2,
-                tags=("selection_handle", self.id)
-            )
-            self.canvas_items.append(handle_id)
-        
-        # Selection border
-        border_id = canvas.create_rectangle(
-            x1 - 1, y1 - 1, x2 + 1, y2 + 1,
-            fill="",
-            outline="#2563eb",
-            width=2,
-            dash=(5, 5),
-            tags=("selection_border", self.id)
-        )
-        self.canvas_items.append(border_id)
-    
-    def to_dict(self):
-        """Convert component to dictionary"""
-        data = super().to_dict()
-        data['placeholder_text'] = self.placeholder_text
-        data['placeholder_color'] = self.placeholder_color
-        return data
-    
-    def from_dict(self, data):
-        """Load component from dictionary"""
-        super().from_dict(data)
-        self.placeholder_text = data.get('placeholder_text', self.placeholder_text)
-        self.placeholder_color = data.get('placeholder_color', self.placeholder_color)
@@ -3,6 +3,17 @@ Configuration module initialization
 """
 
 from .settings import AppSettings
-from .themes import AppThemes
 
 __all__ = ['AppSettings', 'AppThemes']
+
+# Themes are imported on first access
+_LAZY_EXPORTS = {
+    'AppThemes': '.themes'
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        from importlib import import_module
+        return getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
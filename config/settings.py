@@ -2,168 +2,326 @@
 Application settings management
 """
 
-import json
+import atexit
 import os
+import threading
+import time
+import weakref
 from pathlib import Path
+from types import MappingProxyType
+
+from utils import json_io
+
+
+def _compute_settings_dir():
+    """Return the settings directory in the user's home directory"""
+    home = Path.home()
+    if os.name == 'nt':  # Windows
+        return home / "AppData" / "Local" / "MiniFigma"
+    return home / ".config" / "minifigma"  # macOS and Linux
+
+
+# Resolved once per process
+_SETTINGS_DIR = _compute_settings_dir()
+
+# Seconds to wait after a change before writing the settings file
+SAVE_DELAY = 1.0
+
+# Seconds a recent file's existence check stays valid
+EXISTS_TTL = 5.0
+
+# Settings managers whose pending changes are written when the interpreter exits
+_LIVE_SETTINGS = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_live_settings():
+    """Write the pending changes of every settings manager still alive"""
+    for app_settings in list(_LIVE_SETTINGS):
+        app_settings.flush()
+
+
+def _deep_freeze(value):
+    """Return a read-only view of nested settings: dicts become mapping proxies, lists tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _deep_freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_deep_freeze(item) for item in value)
+    return value
+
+
+def _deep_thaw(value):
+    """Return a fresh mutable copy of settings frozen by _deep_freeze"""
+    if isinstance(value, MappingProxyType):
+        return {key: _deep_thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_deep_thaw(item) for item in value]
+    return value
+
+
+DEFAULT_SETTINGS = _deep_freeze({
+    "appearance": {
+        "theme": "dark",
+        "color_scheme": "blue",
+        "window_geometry": "1400x900",
+        "window_state": "normal"
+    },
+    "canvas": {
+        "grid_size": 20,
+        "show_grid": True,
+        "snap_to_grid": True,
+        "canvas_width": 800,
+        "canvas_height": 600,
+        "background_color": "#f8fafc",
+        "grid_color": "#e2e8f0"
+    },
+    "editor": {
+        "auto_save": True,
+        "auto_save_interval": 300,  # seconds
+        "backup_count": 5,
+        "default_component_colors": {
+            "rectangle": {"fill": "#e5e7eb", "border": "#6b7280"},
+            "button": {"fill": "#3b82f6", "border": "#1e40af", "text": "#ffffff"},
+            "input": {"fill": "#ffffff", "border": "#d1d5db", "text": "#374151"},
+            "text": {"fill": "", "border": "", "text": "#374151"}
+        }
+    },
+    "export": {
+        "default_format": "png",
+        "png_quality": 95,
+        "svg_precision": 2,
+        "include_metadata": True,
+        "default_export_path": ""
+    },
+    "recent_files": {
+        "max_files": 10,
+        "files": []
+    },
+    "ui": {
+        "show_properties_panel": True,
+        "show_component_palette": True,
+        "properties_panel_width": 250,
+        "component_palette_width": 200,
+        "toolbar_visible": True
+    },
+    "shortcuts": {
+        "new_file": "Ctrl+N",
+        "open_file": "Ctrl+O",
+        "save_file": "Ctrl+S",
+        "save_as": "Ctrl+Shift+S",
+        "export": "Ctrl+E",
+        "undo": "Ctrl+Z",
+        "redo": "Ctrl+Y",
+        "delete": "Delete",
+        "select_all": "Ctrl+A",
+        "copy": "Ctrl+C",
+        "paste": "Ctrl+V",
+        "duplicate": "Ctrl+D"
+    }
+})
+
 
 class AppSettings:
     """Manages application settings and preferences"""
     
+    # Keyword names accepted by set_export_settings/set_ui_settings and the paths they set
+    _EXPORT_KEYS = MappingProxyType({
+        "format": "export.default_format",
+        "quality": "export.png_quality",
+        "precision": "export.svg_precision",
+        "metadata": "export.include_metadata",
+        "path": "export.default_export_path"
+    })
+    _UI_KEYS = MappingProxyType({
+        "properties_panel": "ui.show_properties_panel",
+        "component_palette": "ui.show_component_palette",
+        "properties_width": "ui.properties_panel_width",
+        "palette_width": "ui.component_palette_width",
+        "toolbar": "ui.toolbar_visible"
+    })
+    
     def __init__(self):
         """Initialize settings manager"""
         self.settings_dir = self._get_settings_directory()
-        self.settings_file = os.path.join(self.settings_dir, "settings.json")
+        self.settings_file = self.settings_dir / "settings.json"
         
-        # Default settings
-        self.default_settings = {
-            "appearance": {
-                "theme": "dark",
-                "color_scheme": "blue",
-                "window_geometry": "1400x900",
-                "window_state": "normal"
-            },
-            "canvas": {
-                "grid_size": 20,
-                "show_grid": True,
-                "snap_to_grid": True,
-                "canvas_width": 800,
-                "canvas_height": 600,
-                "background_color": "#f8fafc",
-                "grid_color": "#e2e8f0"
-            },
-            "editor": {
-                "auto_save": True,
-                "auto_save_interval": 300,  # seconds
-                "backup_count": 5,
-                "default_component_colors": {
-                    "rectangle": {"fill": "#e5e7eb", "border": "#6b7280"},
-                    "button": {"fill": "#3b82f6", "border": "#1e40af", "text": "#ffffff"},
-                    "input": {"fill": "#ffffff", "border": "#d1d5db", "text": "#374151"},
-                    "text": {"fill": "", "border": "", "text": "#374151"}
-                }
-            },
-            "export": {
-                "default_format": "png",
-                "png_quality": 95,
-                "svg_precision": 2,
-                "include_metadata": True,
-                "default_export_path": ""
-            },
-            "recent_files": {
-                "max_files": 10,
-                "files": []
-            },
-            "ui": {
-                "show_properties_panel": True,
-                "show_component_palette": True,
-                "properties_panel_width": 250,
-                "component_palette_width": 200,
-                "toolbar_visible": True
-            },
-            "shortcuts": {
-                "new_file": "Ctrl+N",
-                "open_file": "Ctrl+O",
-                "save_file": "Ctrl+S",
-                "save_as": "Ctrl+Shift+S",
-                "export": "Ctrl+E",
-                "undo": "Ctrl+Z",
-                "redo": "Ctrl+Y",
-                "delete": "Delete",
-                "select_all": "Ctrl+A",
-                "copy": "Ctrl+C",
-                "paste": "Ctrl+V",
-                "duplicate": "Ctrl+D"
-            }
-        }
+        # Default settings, shared and read-only
+        self.default_settings = DEFAULT_SETTINGS
+        
+        # Dot-notation paths split into keys, and the (parent dict, key) they resolve to
+        self._path_cache = {}
+        self._leaf_cache = {}
+        
+        # Recent file path -> (checked at, exists), see _file_exists()
+        self._exists_cache = {}
+        
+        # Deferred saves: setters mark the settings dirty and a timer writes them once
+        self._dirty = False
+        self._save_timer = None
+        self._save_lock = threading.Lock()  # Held while the tree is changed or written
         
         # Load settings
         self.settings = self.load_settings()
+        
+        _LIVE_SETTINGS.add(self)
+    
+    @property
+    def settings(self):
+        """Current settings tree"""
+        return self._settings
+    
+    @settings.setter
+    def settings(self, value):
+        """Replace the settings tree, dropping leaves resolved against the old one"""
+        self._settings = value
+        self._leaf_cache.clear()
     
     def _get_settings_directory(self):
         """Get the settings directory path"""
-        # Use user's home directory for settings
-        if os.name == 'nt':  # Windows
-            settings_dir = os.path.join(os.path.expanduser("~"), "AppData", "Local", "MiniFigma")
-        else:  # macOS and Linux
-            settings_dir = os.path.join(os.path.expanduser("~"), ".config", "minifigma")
-        
         # Create directory if it doesn't exist
-        Path(settings_dir).mkdir(parents=True, exist_ok=True)
-        return settings_dir
+        if not _SETTINGS_DIR.exists():
+            _SETTINGS_DIR.mkdir(parents=True, exist_ok=True)
+        return _SETTINGS_DIR
     
     def load_settings(self):
         """Load settings from file"""
         if os.path.exists(self.settings_file):
             try:
-                with open(self.settings_file, 'r', encoding='utf-8') as f:
-                    loaded_settings = json.load(f)
+                with open(self.settings_file, 'rb') as f:
+                    loaded_settings = json_io.loads(f.read())
                 
                 # Merge with defaults (in case new settings were added)
                 return self._merge_settings(self.default_settings, loaded_settings)
             
             except Exception as e:
                 print(f"Error loading settings: {e}")
-                return self.default_settings.copy()
+                return _deep_thaw(self.default_settings)
         
-        return self.default_settings.copy()
+        return _deep_thaw(self.default_settings)
     
     def save_settings(self):
         """Save current settings to file"""
+        with self._save_lock:
+            return self._write_settings()
+    
+    def _write_settings(self):
+        """Write the settings file; the caller holds _save_lock"""
         try:
-            with open(self.settings_file, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, indent=2, ensure_ascii=False)
+            self._dirty = False
+            data = json_io.dumps(self.settings, indent=True)
+            
+            # Write beside the file and swap it in, so a crash never leaves half a file
+            temp_file = self.settings_file.with_name(self.settings_file.name + ".tmp")
+            with open(temp_file, 'wb') as f:
+                f.write(data)
+            os.replace(temp_file, self.settings_file)
             return True
         except Exception as e:
             print(f"Error saving settings: {e}")
             return False
     
+    def schedule_save(self):
+        """Save the settings shortly, folding a burst of changes into one write"""
+        self._dirty = True
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+        self._save_timer = threading.Timer(SAVE_DELAY, self._save_if_dirty)
+        self._save_timer.daemon = True
+        self._save_timer.start()
+    
+    def _save_if_dirty(self):
+        """Save the settings if they changed since the last write"""
+        with self._save_lock:
+            if self._dirty:
+                self._write_settings()
+    
+    def flush(self):
+        """Write any pending changes now"""
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+        self._save_if_dirty()
+    
     def _merge_settings(self, default, loaded):
-        """Recursively merge loaded settings with defaults"""
-        result = default.copy()
+        """Merge loaded settings over a copy of the defaults, section by section"""
+        result = _deep_thaw(default)
+        stack = [(result, loaded)]
         
-        for key, value in loaded.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = self._merge_settings(result[key], value)
-            else:
-                result[key] = value
+        while stack:
+            target, source = stack.pop()
+            for key, value in source.items():
+                if isinstance(value, dict) and isinstance(target.get(key), dict):
+                    stack.append((target[key], value))
+                else:
+                    target[key] = value
         
         return result
     
+    def _split_path(self, key_path):
+        """Return the keys of a dot-notation path, splitting each path once"""
+        keys = self._path_cache.get(key_path)
+        if keys is None:
+            keys = tuple(key_path.split('.'))
+            self._path_cache[key_path] = keys
+        return keys
+    
+    def _resolve(self, key_path):
+        """Return the (parent dict, key) a path points at, or None if it has no parent yet"""
+        leaf = self._leaf_cache.get(key_path)
+        if leaf is None:
+            keys = self._split_path(key_path)
+            parent = self.settings
+            try:
+                for key in keys[:-1]:
+                    parent = parent[key]
+            except (KeyError, TypeError):
+                return None
+            if not isinstance(parent, dict):
+                return None
+            leaf = (parent, keys[-1])
+            self._leaf_cache[key_path] = leaf
+        return leaf
+    
     def get(self, key_path, default=None):
         """Get setting value using dot notation (e.g., 'canvas.grid_size')"""
-        keys = key_path.split('.')
-        value = self.settings
-        
-        try:
-            for key in keys:
-                value = value[key]
-            return value
-        except (KeyError, TypeError):
+        leaf = self._resolve(key_path)
+        if leaf is None:
             return default
+        parent, key = leaf
+        return parent.get(key, default)
     
     def set(self, key_path, value):
         """Set setting value using dot notation"""
-        keys = key_path.split('.')
-        setting = self.settings
+        leaf = self._resolve(key_path)
+        if leaf is None:
+            keys = self._split_path(key_path)
+            setting = self.settings
+            
+            # Navigate to the parent of the target key
+            for key in keys[:-1]:
+                if key not in setting:
+                    setting[key] = {}
+                setting = setting[key]
+            leaf = (setting, keys[-1])
         
-        # Navigate to the parent of the target key
-        for key in keys[:-1]:
-            if key not in setting:
-                setting[key] = {}
-            setting = setting[key]
+        parent, key = leaf
+        if isinstance(parent.get(key), dict):
+            # Replacing a section orphans the leaves cached beneath it
+            self._leaf_cache.clear()
         
         # Set the value
-        setting[keys[-1]] = value
+        with self._save_lock:
+            parent[key] = value
     
     def reset_to_defaults(self):
         """Reset all settings to defaults"""
-        self.settings = self.default_settings.copy()
+        self.settings = _deep_thaw(self.default_settings)
         return self.save_settings()
     
     def reset_section(self, section):
         """Reset a specific section to defaults"""
         if section in self.default_settings:
-            self.settings[section] = self.default_settings[section].copy()
+            self.settings[section] = _deep_thaw(self.default_settings[section])
+            self._leaf_cache.clear()
             return self.save_settings()
         return False
     
@@ -175,7 +333,7 @@ class AppSettings:
     def set_theme(self, theme):
         """Set current theme"""
         self.set("appearance.theme", theme)
-        self.save_settings()
+        self.schedule_save()
     
     def get_window_geometry(self):
         """Get window geometry"""
@@ -184,7 +342,7 @@ class AppSettings:
     def set_window_geometry(self, geometry):
         """Set window geometry"""
         self.set("appearance.window_geometry", geometry)
-        self.save_settings()
+        self.schedule_save()
     
     def get_grid_settings(self):
         """Get grid settings"""
@@ -202,40 +360,47 @@ class AppSettings:
             self.set("canvas.show_grid", show)
         if snap is not None:
             self.set("canvas.snap_to_grid", snap)
-        self.save_settings()
+        self.schedule_save()
     
     def add_recent_file(self, file_path):
         """Add file to recent files list"""
-        recent_files = self.get("recent_files.files", [])
         max_files = self.get("recent_files.max_files", 10)
         
-        # Remove if already exists
-        if file_path in recent_files:
-            recent_files.remove(file_path)
-        
-        # Add to beginning
-        recent_files.insert(0, file_path)
+        # Put it first and drop any older entry for it, in one pass
+        recent_files = [file_path]
+        recent_files.extend(f for f in self.get("recent_files.files", []) if f != file_path)
+        self._exists_cache.pop(file_path, None)
         
         # Limit list size
-        recent_files = recent_files[:max_files]
+        del recent_files[max_files:]
         
         self.set("recent_files.files", recent_files)
-        self.save_settings()
+        self.schedule_save()
     
     def get_recent_files(self):
         """Get recent files list"""
         recent_files = self.get("recent_files.files", [])
         
         # Filter out files that no longer exist
-        existing_files = [f for f in recent_files if os.path.exists(f)]
+        existing_files = [f for f in recent_files if self._file_exists(f)]
         
         # Update the list if files were removed
         if len(existing_files) != len(recent_files):
             self.set("recent_files.files", existing_files)
-            self.save_settings()
+            self.schedule_save()
         
         return existing_files
     
+    def _file_exists(self, file_path):
+        """Check whether a file exists, reusing the answer for EXISTS_TTL seconds"""
+        now = time.monotonic()
+        cached = self._exists_cache.get(file_path)
+        if cached is not None and now - cached[0] < EXISTS_TTL:
+            return cached[1]
+        exists = os.path.exists(file_path)
+        self._exists_cache[file_path] = (now, exists)
+        return exists
+    
     def get_component_defaults(self, component_type):
         """Get default colors for a component type"""
         return self.get(f"editor.default_component_colors.{component_type}", {})
@@ -243,7 +408,7 @@ class AppSettings:
     def set_component_defaults(self, component_type, colors):
         """Set default colors for a component type"""
         self.set(f"editor.default_component_colors.{component_type}", colors)
-        self.save_settings()
+        self.schedule_save()
     
     def get_export_settings(self):
         """Get export settings"""
@@ -258,22 +423,16 @@ class AppSettings:
     def set_export_settings(self, **kwargs):
         """Set export settings"""
         for key, value in kwargs.items():
-            if key in ["format", "quality", "precision", "metadata", "path"]:
-                setting_key = {
-                    "format": "export.default_format",
-                    "quality": "export.png_quality", 
-                    "precision": "export.svg_precision",
-                    "metadata": "export.include_metadata",
-                    "path": "export.default_export_path"
-                }[key]
+            setting_key = self._EXPORT_KEYS.get(key)
+            if setting_key is not None:
                 self.set(setting_key, value)
-        self.save_settings()
+        self.schedule_save()
     
     def import_settings(self, file_path):
         """Import settings from a file"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                imported_settings = json.load(f)
+            with open(file_path, 'rb') as f:
+                imported_settings = json_io.loads(f.read())
             
             # Validate and merge
             self.settings = self._merge_settings(self.default_settings, imported_settings)
@@ -286,8 +445,8 @@ class AppSettings:
     def export_settings(self, file_path):
         """Export current settings to a file"""
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, indent=2, ensure_ascii=False)
+            with open(file_path, 'wb') as f:
+                f.write(json_io.dumps(self.settings, indent=True))
             return True
         except Exception as e:
             print(f"Error exporting settings: {e}")
@@ -306,13 +465,7 @@ class AppSettings:
     def set_ui_settings(self, **kwargs):
         """Set UI layout settings"""
         for key, value in kwargs.items():
-            if key in ["properties_panel", "component_palette", "properties_width", "palette_width", "toolbar"]:
-                setting_key = {
-                    "properties_panel": "ui.show_properties_panel",
-                    "component_palette": "ui.show_component_palette",
-                    "properties_width": "ui.properties_panel_width",
-                    "palette_width": "ui.component_palette_width",
-                    "toolbar": "ui.toolbar_visible"
-                }[key]
+            setting_key = self._UI_KEYS.get(key)
+            if setting_key is not None:
                 self.set(setting_key, value)
-        self.save_settings()
+        self.schedule_save()
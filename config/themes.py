@@ -2,192 +2,234 @@
 Theme configuration for the application
 """
 
+import re
+from functools import lru_cache
+
+from utils import json_io
+
+# Hex colors: #RGB, #RRGGBB, #RRGGBBAA
+_HEX_COLOR_RE = re.compile(r"#(?:[0-9a-fA-F]{3}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})")
+
+# Named colors accepted in themes (basic set)
+_NAMED_COLORS = frozenset((
+    "red", "green", "blue", "yellow", "orange", "purple", "pink",
+    "black", "white", "gray", "grey", "brown", "cyan", "magenta"
+))
+
+
+def _dark_theme():
+    """Build the dark theme"""
+    return {
+        "name": "Dark",
+        "description": "Dark theme with blue accents",
+        "appearance_mode": "dark",
+        "color_theme": "blue",
+        "colors": {
+            "primary": "#3b82f6",
+            "primary_hover": "#2563eb",
+            "secondary": "#6b7280",
+            "secondary_hover": "#4b5563",
+            "success": "#10b981",
+            "success_hover": "#059669",
+            "warning": "#f59e0b",
+            "warning_hover": "#d97706",
+            "error": "#ef4444",
+            "error_hover": "#dc2626",
+            "background": "#1f2937",
+            "surface": "#374151",
+            "surface_variant": "#4b5563",
+            "on_background": "#f9fafb",
+            "on_surface": "#e5e7eb",
+            "border": "#6b7280",
+            "border_light": "#9ca3af",
+            "text_primary": "#f9fafb",
+            "text_secondary": "#d1d5db",
+            "text_disabled": "#9ca3af"
+        },
+        "canvas": {
+            "background": "#f8fafc",
+            "grid": "#e2e8f0",
+            "selection": "#3b82f6",
+            "selection_handles": "#2563eb",
+            "guides": "#8b5cf6"
+        }
+    }
+
+
+def _light_theme():
+    """Build the light theme"""
+    return {
+        "name": "Light",
+        "description": "Light theme with blue accents",
+        "appearance_mode": "light",
+        "color_theme": "blue",
+        "colors": {
+            "primary": "#3b82f6",
+            "primary_hover": "#2563eb",
+            "secondary": "#6b7280",
+            "secondary_hover": "#4b5563",
+            "success": "#10b981",
+            "success_hover": "#059669",
+            "warning": "#f59e0b",
+            "warning_hover": "#d97706",
+            "error": "#ef4444",
+            "error_hover": "#dc2626",
+            "background": "#ffffff",
+            "surface": "#f9fafb",
+            "surface_variant": "#f3f4f6",
+            "on_background": "#111827",
+            "on_surface": "#374151",
+            "border": "#d1d5db",
+            "border_light": "#e5e7eb",
+            "text_primary": "#111827",
+            "text_secondary": "#4b5563",
+            "text_disabled": "#9ca3af"
+        },
+        "canvas": {
+            "background": "#ffffff",
+            "grid": "#f3f4f6",
+            "selection": "#3b82f6",
+            "selection_handles": "#2563eb",
+            "guides": "#8b5cf6"
+        }
+    }
+
+
+def _dark_green_theme():
+    """Build the dark green theme"""
+    return {
+        "name": "Dark Green",
+        "description": "Dark theme with green accents",
+        "appearance_mode": "dark",
+        "color_theme": "green",
+        "colors": {
+            "primary": "#10b981",
+            "primary_hover": "#059669",
+            "secondary": "#6b7280",
+            "secondary_hover": "#4b5563",
+            "success": "#22c55e",
+            "success_hover": "#16a34a",
+            "warning": "#f59e0b",
+            "warning_hover": "#d97706",
+            "error": "#ef4444",
+            "error_hover": "#dc2626",
+            "background": "#1f2937",
+            "surface": "#374151",
+            "surface_variant": "#4b5563",
+            "on_background": "#f9fafb",
+            "on_surface": "#e5e7eb",
+            "border": "#6b7280",
+            "border_light": "#9ca3af",
+            "text_primary": "#f9fafb",
+            "text_secondary": "#d1d5db",
+            "text_disabled": "#9ca3af"
+        },
+        "canvas": {
+            "background": "#f8fafc",
+            "grid": "#e2e8f0",
+            "selection": "#10b981",
+            "selection_handles": "#059669",
+            "guides": "#8b5cf6"
+        }
+    }
+
+
+def _dark_purple_theme():
+    """Build the dark purple theme"""
+    return {
+        "name": "Dark Purple",
+        "description": "Dark theme with purple accents",
+        "appearance_mode": "dark",
+        "color_theme": "dark-blue",
+        "colors": {
+            "primary": "#8b5cf6",
+            "primary_hover": "#7c3aed",
+            "secondary": "#6b7280",
+            "secondary_hover": "#4b5563",
+            "success": "#10b981",
+            "success_hover": "#059669",
+            "warning": "#f59e0b",
+            "warning_hover": "#d97706",
+            "error": "#ef4444",
+            "error_hover": "#dc2626",
+            "background": "#1f2937",
+            "surface": "#374151",
+            "surface_variant": "#4b5563",
+            "on_background": "#f9fafb",
+            "on_surface": "#e5e7eb",
+            "border": "#6b7280",
+            "border_light": "#9ca3af",
+            "text_primary": "#f9fafb",
+            "text_secondary": "#d1d5db",
+            "text_disabled": "#9ca3af"
+        },
+        "canvas": {
+            "background": "#f8fafc",
+            "grid": "#e2e8f0",
+            "selection": "#8b5cf6",
+            "selection_handles": "#7c3aed",
+            "guides": "#3b82f6"
+        }
+    }
+
+
+def _high_contrast_theme():
+    """Build the high contrast theme"""
+    return {
+        "name": "High Contrast",
+        "description": "High contrast theme for accessibility",
+        "appearance_mode": "dark",
+        "color_theme": "blue",
+        "colors": {
+            "primary": "#ffffff",
+            "primary_hover": "#e5e7eb",
+            "secondary": "#000000",
+            "secondary_hover": "#1f2937",
+            "success": "#00ff00",
+            "success_hover": "#00cc00",
+            "warning": "#ffff00",
+            "warning_hover": "#cccc00",
+            "error": "#ff0000",
+            "error_hover": "#cc0000",
+            "background": "#000000",
+            "surface": "#1f2937",
+            "surface_variant": "#374151",
+            "on_background": "#ffffff",
+            "on_surface": "#ffffff",
+            "border": "#ffffff",
+            "border_light": "#d1d5db",
+            "text_primary": "#ffffff",
+            "text_secondary": "#ffffff",
+            "text_disabled": "#9ca3af"
+        },
+        "canvas": {
+            "background": "#ffffff",
+            "grid": "#000000",
+            "selection": "#ffff00",
+            "selection_handles": "#ff0000",
+            "guides": "#00ff00"
+        }
+    }
+
+
+# Builders for the built-in themes; a theme is only built once it is used
+_THEME_BUILDERS = {
+    "dark": _dark_theme,
+    "light": _light_theme,
+    "dark_green": _dark_green_theme,
+    "dark_purple": _dark_purple_theme,
+    "high_contrast": _high_contrast_theme
+}
+
+
 class AppThemes:
     """Manages application themes and color schemes"""
     
     def __init__(self):
         """Initialize theme manager"""
-        self.themes = {
-            "dark": {
-                "name": "Dark",
-                "description": "Dark theme with blue accents",
-                "appearance_mode": "dark",
-                "color_theme": "blue",
-                "colors": {
-                    "primary": "#3b82f6",
-                    "primary_hover": "#2563eb",
-                    "secondary": "#6b7280",
-                    "secondary_hover": "#4b5563",
-                    "success": "#10b981",
-                    "success_hover": "#059669",
-                    "warning": "#f59e0b",
-                    "warning_hover": "#d97706",
-                    "error": "#ef4444",
-                    "error_hover": "#dc2626",
-                    "background": "#1f2937",
-                    "surface": "#374151",
-                    "surface_variant": "#4b5563",
-                    "on_background": "#f9fafb",
-                    "on_surface": "#e5e7eb",
-                    "border": "#6b7280",
-                    "border_light": "#9ca3af",
-                    "text_primary": "#f9fafb",
-                    "text_secondary": "#d1d5db",
-                    "text_disabled": "#9ca3af"
-                },
-                "canvas": {
-                    "background": "#f8fafc",
-                    "grid": "#e2e8f0",
-                    "selection": "#3b82f6",
-                    "selection_handles": "#2563eb",
-                    "guides": "#8b5cf6"
-                }
-            },
-            
-            "light": {
-                "name": "Light",
-                "description": "Light theme with blue accents",
-                "appearance_mode": "light",
-                "color_theme": "blue",
-                "colors": {
-                    "primary": "#3b82f6",
-                    "primary_hover": "#2563eb",
-                    "secondary": "#6b7280",
-                    "secondary_hover": "#4b5563",
-                    "success": "#10b981",
-                    "success_hover": "#059669",
-                    "warning": "#f59e0b",
-                    "warning_hover": "#d97706",
-                    "error": "#ef4444",
-                    "error_hover": "#dc2626",
-                    "background": "#ffffff",
-                    "surface": "#f9fafb",
-                    "surface_variant": "#f3f4f6",
-                    "on_background": "#111827",
-                    "on_surface": "#374151",
-                    "border": "#d1d5db",
-                    "border_light": "#e5e7eb",
-                    "text_primary": "#111827",
-                    "text_secondary": "#4b5563",
-                    "text_disabled": "#9ca3af"
-                },
-                "canvas": {
-                    "background": "#ffffff",
-                    "grid": "#f3f4f6",
-                    "selection": "#3b82f6",
-                    "selection_handles": "#2563eb",
-                    "guides": "#8b5cf6"
-                }
-            },
-            
-            "dark_green": {
-                "name": "Dark Green",
-                "description": "Dark theme with green accents",
-                "appearance_mode": "dark",
-                "color_theme": "green",
-                "colors": {
-                    "primary": "#10b981",
-                    "primary_hover": "#059669",
-                    "secondary": "#6b7280",
-                    "secondary_hover": "#4b5563",
-                    "success": "#22c55e",
-                    "success_hover": "#16a34a",
-                    "warning": "#f59e0b",
-                    "warning_hover": "#d97706",
-                    "error": "#ef4444",
-                    "error_hover": "#dc2626",
-                    "background": "#1f2937",
-                    "surface": "#374151",
-                    "surface_variant": "#4b5563",
-                    "on_background": "#f9fafb",
-                    "on_surface": "#e5e7eb",
-                    "border": "#6b7280",
-                    "border_light": "#9ca3af",
-                    "text_primary": "#f9fafb",
-                    "text_secondary": "#d1d5db",
-                    "text_disabled": "#9ca3af"
-                },
-                "canvas": {
-                    "background": "#f8fafc",
-                    "grid": "#e2e8f0",
-                    "selection": "#10b981",
-                    "selection_handles": "#059669",
-                    "guides": "#8b5cf6"
-                }
-            },
-            
-            "dark_purple": {
-                "name": "Dark Purple",
-                "description": "Dark theme with purple accents",
-                "appearance_mode": "dark",
-                "color_theme": "dark-blue",
-                "colors": {
-                    "primary": "#8b5cf6",
-                    "primary_hover": "#7c3aed",
-                    "secondary": "#6b7280",
-                    "secondary_hover": "#4b5563",
-                    "success": "#10b981",
-                    "success_hover": "#059669",
-                    "warning": "#f59e0b",
-                    "warning_hover": "#d97706",
-                    "error": "#ef4444",
-                    "error_hover": "#dc2626",
-                    "background": "#1f2937",
-                    "surface": "#374151",
-                    "surface_variant": "#4b5563",
-                    "on_background": "#f9fafb",
-                    "on_surface": "#e5e7eb",
-                    "border": "#6b7280",
-                    "border_light": "#9ca3af",
-                    "text_primary": "#f9fafb",
-                    "text_secondary": "#d1d5db",
-                    "text_disabled": "#9ca3af"
-                },
-                "canvas": {
-                    "background": "#f8fafc",
-                    "grid": "#e2e8f0",
-                    "selection": "#8b5cf6",
-                    "selection_handles": "#7c3aed",
-                    "guides": "#3b82f6"
-                }
-            },
-            
-            "high_contrast": {
-                "name": "High Contrast",
-                "description": "High contrast theme for accessibility",
-                "appearance_mode": "dark",
-                "color_theme": "blue",
-                "colors": {
-                    "primary": "#ffffff",
-                    "primary_hover": "#e5e7eb",
-                    "secondary": "#000000",
-                    "secondary_hover": "#1f2937",
-                    "success": "#00ff00",
-                    "success_hover": "#00cc00",
-                    "warning": "#ffff00",
-                    "warning_hover": "#cccc00",
-                    "error": "#ff0000",
-                    "error_hover": "#cc0000",
-                    "background": "#000000",
-                    "surface": "#1f2937",
-                    "surface_variant": "#374151",
-                    "on_background": "#ffffff",
-                    "on_surface": "#ffffff",
-                    "border": "#ffffff",
-                    "border_light": "#d1d5db",
-                    "text_primary": "#ffffff",
-                    "text_secondary": "#ffffff",
-                    "text_disabled": "#9ca3af"
-                },
-                "canvas": {
-                    "background": "#ffffff",
-                    "grid": "#000000",
-                    "selection": "#ffff00",
-                    "selection_handles": "#ff0000",
-                    "guides": "#00ff00"
-                }
-            }
-        }
+        # Themes are built on first use; imported themes are registered already built
+        self._theme_builders = dict(_THEME_BUILDERS)
+        self._theme_cache = {}
         
         self.color_schemes = {
             "blue": {
@@ -206,21 +248,56 @@ class AppThemes:
                 "secondary": "#1e3a8a"
             }
         }
+        
+        # Dicts derived from each theme when it is built; callers must not modify them
+        self._theme_info = {}
+        self._component_colors = {}
+        self._preview_data = {}
+    
+    @property
+    def themes(self):
+        """All themes by name, building any that have not been used yet"""
+        for theme_name in self._theme_builders:
+            self.get_theme(theme_name)
+        return self._theme_cache
+    
+    def _add_theme(self, theme_name, theme):
+        """Store a built theme and the dicts derived from it"""
+        # Derive everything first, so a theme that fails leaves nothing behind
+        info = self._build_theme_info(theme)
+        component_colors = self._build_component_colors(theme)
+        preview_data = self._build_preview_data(theme)
+        
+        self._theme_cache[theme_name] = theme
+        self._theme_info[theme_name] = info
+        self._component_colors[theme_name] = component_colors
+        self._preview_data[theme_name] = preview_data
+    
+    def _resolve_theme_name(self, theme_name):
+        """Return the name of the built theme to use, falling back to dark"""
+        if theme_name not in self._theme_builders:
+            theme_name = "dark"
+        if theme_name not in self._theme_cache:
+            self._add_theme(theme_name, self._theme_builders[theme_name]())
+        return theme_name
     
     def get_theme(self, theme_name):
         """Get theme configuration by name"""
-        return self.themes.get(theme_name, self.themes["dark"])
+        return self._theme_cache[self._resolve_theme_name(theme_name)]
     
     def get_available_themes(self):
         """Get list of available theme names"""
-        return list(self.themes.keys())
+        return list(self._theme_builders)
     
     def get_theme_info(self, theme_name):
         """Get basic info about a theme"""
-        theme = self.get_theme(theme_name)
+        return self._theme_info[self._resolve_theme_name(theme_name)]
+    
+    def _build_theme_info(self, theme):
+        """Build the basic info for a theme"""
         return {
             "name": theme["name"],
-            "description": theme["description"],
+            "description": theme.get("description", ""),
             "preview_color": theme["colors"]["primary"]
         }
     
@@ -239,18 +316,22 @@ class AppThemes:
     
     def get_component_colors(self, theme_name):
         """Get component-specific colors for a theme"""
-        theme = self.get_theme(theme_name)
+        return self._component_colors[self._resolve_theme_name(theme_name)]
+    
+    def _build_component_colors(self, theme):
+        """Build the component colors for a theme"""
+        # validate_theme doesn't require the variants, so fall back to the base colors
         colors = theme["colors"]
         
         return {
             "rectangle": {
-                "fill": colors["surface_variant"],
+                "fill": colors.get("surface_variant", colors["surface"]),
                 "border": colors["border"],
                 "text": colors["text_primary"]
             },
             "button": {
                 "fill": colors["primary"],
-                "border": colors["primary_hover"],
+                "border": colors.get("primary_hover", colors["primary"]),
                 "text": "#ffffff"
             },
             "input": {
@@ -272,15 +353,16 @@ class AppThemes:
     
     def create_custom_theme(self, name, base_theme="dark", color_overrides=None):
         """Create a custom theme based on an existing theme"""
-        base = self.get_theme(base_theme).copy()
-        
-        if color_overrides:
-            base["colors"].update(color_overrides)
-        
-        base["name"] = name
-        base["description"] = f"Custom theme based on {base_theme}"
+        base = self.get_theme(base_theme)
         
-        return base
+        # New colors and canvas dicts, so the custom theme never shares them with its base
+        return {
+            **base,
+            "name": name,
+            "description": f"Custom theme based on {base_theme}",
+            "colors": {**base["colors"], **(color_overrides or {})},
+            "canvas": dict(base["canvas"])
+        }
     
     def validate_theme(self, theme_config):
         """Validate theme configuration"""
@@ -316,37 +398,23 @@ class AppThemes:
         
         return True, "Valid theme configuration"
     
-    def _is_valid_color(self, color_value):
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _is_valid_color(color_value):
         """Basic validation for color values"""
         if not color_value:  # Empty string is valid (transparent)
             return True
         
-        # Check hex color format
-        if color_value.startswith("#"):
-            if len(color_value) in [4, 7, 9]:  # #RGB, #RRGGBB, #RRGGBBAA
-                try:
-                    int(color_value[1:], 16)
-                    return True
-                except ValueError:
-                    return False
-        
-        # Check named colors (basic set)
-        named_colors = [
-            "red", "green", "blue", "yellow", "orange", "purple", "pink",
-            "black", "white", "gray", "grey", "brown", "cyan", "magenta"
-        ]
-        
-        return color_value.lower() in named_colors
+        return (_HEX_COLOR_RE.fullmatch(color_value) is not None or
+                color_value.lower() in _NAMED_COLORS)
     
     def export_theme(self, theme_name, file_path):
         """Export theme to JSON file"""
-        import json
-        
         theme = self.get_theme(theme_name)
         
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(theme, f, indent=2, ensure_ascii=False)
+            with open(file_path, 'wb') as f:
+                f.write(json_io.dumps(theme, indent=True))
             return True
         except Exception as e:
             print(f"Error exporting theme: {e}")
@@ -354,11 +422,9 @@ class AppThemes:
     
     def import_theme(self, file_path):
         """Import theme from JSON file"""
-        import json
-        
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                theme_config = json.load(f)
+            with open(file_path, 'rb') as f:
+                theme_config = json_io.loads(f.read())
             
             # Validate theme
             is_valid, message = self.validate_theme(theme_config)
@@ -370,12 +436,13 @@ class AppThemes:
             original_name = theme_name
             counter = 1
             
-            while theme_name in self.themes:
+            while theme_name in self._theme_builders:
                 theme_name = f"{original_name}_{counter}"
                 counter += 1
             
             theme_config["name"] = theme_name
-            self.themes[theme_name] = theme_config
+            self._add_theme(theme_name, theme_config)
+            self._theme_builders[theme_name] = theme_config.copy
             
             return True, f"Theme imported as '{theme_name}'"
         
@@ -384,7 +451,10 @@ class AppThemes:
     
     def get_theme_preview_data(self, theme_name):
         """Get data for theme preview"""
-        theme = self.get_theme(theme_name)
+        return self._preview_data[self._resolve_theme_name(theme_name)]
+    
+    def _build_preview_data(self, theme):
+        """Build the preview data for a theme"""
         colors = theme["colors"]
         canvas = theme["canvas"]
         
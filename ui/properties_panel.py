@@ -2,9 +2,14 @@
 Properties panel for editing component properties
 """
 
-import customtkinter as ctk
+import time
 from tkinter import colorchooser
 
+import customtkinter as ctk
+
+# Minimum seconds between refreshes queued with mark_dirty
+DIRTY_REFRESH_INTERVAL = 0.033
+
 class PropertiesPanel(ctk.CTkFrame):
     """Properties panel for component editing"""
     
@@ -14,6 +19,11 @@ class PropertiesPanel(ctk.CTkFrame):
         self.main_window = main_window
         self.current_component = None
         
+        # Refreshes requested during drags are coalesced by mark_dirty
+        self._dirty_component = None
+        self._refresh_after_id = None
+        self._last_refresh = 0.0
+        
         self.setup_ui()
     
     def setup_ui(self):
@@ -287,8 +297,37 @@ class PropertiesPanel(ctk.CTkFrame):
         # Add some space
         ctk.CTkFrame(self.actions_frame, height=10, fg_color="transparent").pack()
     
+    def mark_dirty(self, component):
+        """Queue a refresh for a component that is changing rapidly"""
+        self._dirty_component = component
+        if self._refresh_after_id is not None:
+            return
+        
+        # Refreshing rewrites every field, so do it at most ~30 times a second
+        wait = DIRTY_REFRESH_INTERVAL - (time.monotonic() - self._last_refresh)
+        if wait > 0:
+            self._refresh_after_id = self.after(int(wait * 1000) + 1, self._flush_dirty)
+        else:
+            self._refresh_after_id = self.after_idle(self._flush_dirty)
+    
+    def _flush_dirty(self):
+        """Apply the refresh queued by mark_dirty"""
+        self._refresh_after_id = None
+        component = self._dirty_component
+        if component is not None:
+            self.update_selection(component)
+    
+    def _cancel_dirty(self):
+        """Drop a queued refresh superseded by a direct update"""
+        self._dirty_component = None
+        if self._refresh_after_id is not None:
+            self.after_cancel(self._refresh_after_id)
+            self._refresh_after_id = None
+    
     def update_selection(self, component):
         """Update the properties panel with the selected component"""
+        self._cancel_dirty()
+        self._last_refresh = time.monotonic()
         self.current_component = component
         
         if component:
@@ -336,6 +375,7 @@ class PropertiesPanel(ctk.CTkFrame):
     
     def clear_selection(self):
         """Clear the properties panel"""
+        self._cancel_dirty()
         self.current_component = None
         self.properties_container.pack_forget()
         self.no_selection_label.pack(pady=20)
@@ -348,11 +388,16 @@ class PropertiesPanel(ctk.CTkFrame):
         try:
             x = float(self.x_entry.get())
             y = float(self.y_entry.get())
-            self.current_component.set_position(x, y)
-            self.current_component.draw(self.main_window.design_canvas.canvas)
-            self.main_window.mark_modified()
         except ValueError:
-            pass  # Invalid input, ignore
+            return  # Invalid input, ignore
+        
+        component = self.current_component
+        old_position = (component.x, component.y)
+        component.set_position(x, y)
+        component.draw(self.main_window.design_canvas.canvas)
+        if self.main_window.canvas_manager.record_geometry(
+                component, old_position, (component.width, component.height)):
+            self.main_window.mark_modified()
     
     def on_size_change(self, event=None):
         """Handle size change"""
@@ -362,19 +407,23 @@ class PropertiesPanel(ctk.CTkFrame):
         try:
             width = float(self.width_entry.get())
             height = float(self.height_entry.get())
-            self.current_component.resize(width, height)
-            self.current_component.draw(self.main_window.design_canvas.canvas)
-            self.main_window.mark_modified()
         except ValueError:
-            pass  # Invalid input, ignore
+            return  # Invalid input, ignore
+        
+        component = self.current_component
+        old_size = (component.width, component.height)
+        component.resize(width, height)
+        component.draw(self.main_window.design_canvas.canvas)
+        if self.main_window.canvas_manager.record_geometry(
+                component, (component.x, component.y), old_size):
+            self.main_window.mark_modified()
     
     def on_text_change(self, event=None):
         """Handle text change"""
         if not self.current_component:
             return
         
-        self.current_component.text = self.text_entry.get()
-        self.current_component.draw(self.main_window.design_canvas.canvas)
+        self._set_properties(text=self.text_entry.get())
         self.main_window.mark_modified()
     
     def on_font_change(self, value=None):
@@ -382,9 +431,10 @@ class PropertiesPanel(ctk.CTkFrame):
         if not self.current_component:
             return
         
-        self.current_component.font_size = int(self.font_size_var.get())
-        self.current_component.font_weight = self.font_weight_var.get()
-        self.current_component.draw(self.main_window.design_canvas.canvas)
+        self._set_properties(
+            font_size=int(self.font_size_var.get()),
+            font_weight=self.font_weight_var.get()
+        )
         self.main_window.mark_modified()
     
     def on_text_align_change(self, value=None):
@@ -392,8 +442,7 @@ class PropertiesPanel(ctk.CTkFrame):
         if not self.current_component or not hasattr(self.current_component, 'text_align'):
             return
         
-        self.current_component.text_align = self.text_align_var.get()
-        self.current_component.draw(self.main_window.design_canvas.canvas)
+        self._set_properties(text_align=self.text_align_var.get())
         self.main_window.mark_modified()
     
     def on_border_width_change(self, value=None):
@@ -401,8 +450,7 @@ class PropertiesPanel(ctk.CTkFrame):
         if not self.current_component:
             return
         
-        self.current_component.border_width = int(self.border_width_var.get())
-        self.current_component.draw(self.main_window.design_canvas.canvas)
+        self._set_properties(border_width=int(self.border_width_var.get()))
         self.main_window.mark_modified()
     
     def on_corner_radius_change(self, value=None):
@@ -410,10 +458,13 @@ class PropertiesPanel(ctk.CTkFrame):
         if not self.current_component:
             return
         
-        self.current_component.corner_radius = int(self.corner_radius_var.get())
-        self.current_component.draw(self.main_window.design_canvas.canvas)
+        self._set_properties(corner_radius=int(self.corner_radius_var.get()))
         self.main_window.mark_modified()
     
+    def _set_properties(self, **values):
+        """Apply an edit to the current component as one undoable action"""
+        self.main_window.canvas_manager.set_component_properties(self.current_component, **values)
+    
     def choose_fill_color(self):
         """Choose fill color"""
         if not self.current_component:
@@ -425,9 +476,8 @@ class PropertiesPanel(ctk.CTkFrame):
         )
         
         if color[1]:  # color[1] is the hex value
-            self.current_component.fill_color = color[1]
+            self._set_properties(fill_color=color[1])
             self.fill_color_btn.configure(fg_color=color[1])
-            self.current_component.draw(self.main_window.design_canvas.canvas)
             self.main_window.mark_modified()
     
     def choose_border_color(self):
@@ -441,9 +491,8 @@ class PropertiesPanel(ctk.CTkFrame):
         )
         
         if color[1]:
-            self.current_component.border_color = color[1]
+            self._set_properties(border_color=color[1])
             self.border_color_btn.configure(fg_color=color[1])
-            self.current_component.draw(self.main_window.design_canvas.canvas)
             self.main_window.mark_modified()
     
     def choose_text_color(self):
@@ -457,9 +506,8 @@ class PropertiesPanel(ctk.CTkFrame):
         )
         
         if color[1]:
-            self.current_component.text_color = color[1]
+            self._set_properties(text_color=color[1])
             self.text_color_btn.configure(fg_color=color[1])
-            self.current_component.draw(self.main_window.design_canvas.canvas)
             self.main_window.mark_modified()
     
     def delete_component(self):
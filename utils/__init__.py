@@ -3,7 +3,14 @@ Utils module initialization
 """
 
 from .file_manager import FileManager
-from .export_manager import ExportManager
 from .alignment_helper import AlignmentHelper
 
 __all__ = ['FileManager', 'ExportManager', 'AlignmentHelper']
+
+
+def __getattr__(name):
+    # ExportManager pulls in Pillow, so only import it when first requested
+    if name == 'ExportManager':
+        from .export_manager import ExportManager
+        return ExportManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
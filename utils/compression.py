@@ -0,0 +1,29 @@
+"""
+Byte compression helpers backed by zstandard when it is available
+"""
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional, data is stored uncompressed
+    zstandard = None
+
+# Every zstd frame starts with this magic number
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+available = zstandard is not None
+
+
+def compress(data):
+    """Compress bytes with fast zstd, or return them unchanged"""
+    if zstandard is None:
+        return data
+    return zstandard.ZstdCompressor(level=1).compress(data)
+
+
+def decompress(data):
+    """Decompress zstd bytes; anything else is returned unchanged"""
+    if not data.startswith(_ZSTD_MAGIC):
+        return data
+    if zstandard is None:
+        raise RuntimeError("zstandard is required to read compressed data")
+    return zstandard.ZstdDecompressor().decompress(data)
@@ -174,6 +174,8 @@ class ExportManager:
                     self._draw_arc_to_image(canvas, item, draw, offset_x, offset_y)
                 elif item_type == "line":
                     self._draw_line_to_image(canvas, item, draw, offset_x, offset_y)
+                elif item_type == "polygon":
+                    self._draw_polygon_to_image(canvas, item, draw, offset_x, offset_y)
             except Exception as e:
                 print(f"Warning: Failed to draw item {item}: {e}")
                 continue
@@ -281,6 +283,27 @@ class ExportManager:
                 
                 draw.line(adjusted_coords, fill=fill_color, width=width)
     
+    def _draw_polygon_to_image(self, canvas, item, draw, offset_x, offset_y):
+        """Draw polygon item (e.g. a rounded box) to PIL image"""
+        coords = canvas.coords(item)
+        if len(coords) >= 6:
+            # Adjust coordinates
+            adjusted_coords = []
+            for i in range(0, len(coords) - 1, 2):
+                adjusted_coords.extend([coords[i] - offset_x, coords[i + 1] - offset_y])
+            
+            # Get colors
+            fill_color = canvas.itemcget(item, "fill") or None
+            outline_color = canvas.itemcget(item, "outline") or None
+            width = int(canvas.itemcget(item, "width") or 1)
+            
+            draw.polygon(
+                adjusted_coords,
+                fill=fill_color,
+                outline=outline_color,
+                width=width
+            )
+    
     def _component_to_svg(self, component, svg_parent, offset_x, offset_y):
         """Convert a component to SVG element"""
         comp_type = component.get("type", "rectangle")
@@ -6,6 +6,8 @@ import json
 import os
 from datetime import datetime
 
+from utils import json_io
+
 class FileManager:
     """Handles file operations for design data"""
     
@@ -33,8 +35,8 @@ class FileManager:
                 os.makedirs(directory)
             
             # Write to file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(save_data, f, indent=2, ensure_ascii=False)
+            with open(file_path, 'wb') as f:
+                f.write(json_io.dumps(save_data, indent=True))
             
             return True
             
@@ -47,8 +49,8 @@ class FileManager:
             if not os.path.exists(file_path):
                 raise FileNotFoundError(f"File not found: {file_path}")
             
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(file_path, 'rb') as f:
+                data = json_io.loads(f.read())
             
             # Handle different file formats
             if "design" in data:
@@ -82,8 +84,8 @@ class FileManager:
     def export_to_json(self, design_data, file_path):
         """Export design data as a clean JSON file (without metadata)"""
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(design_data, f, indent=2, ensure_ascii=False)
+            with open(file_path, 'wb') as f:
+                f.write(json_io.dumps(design_data, indent=True))
             return True
         except Exception as e:
             raise Exception(f"Failed to export JSON: {str(e)}")